@@ -0,0 +1,11 @@
+"""
+Micro-benchmarks for the pipeline's pure hot paths.
+
+Run from the repository root:
+
+    python -m benchmarks.run                      # every benchmark, both scales
+    python -m benchmarks.run --scale production -k storage
+    python -m benchmarks.run --compare <commit>   # flag regressions against a saved run
+
+Results are saved to benchmarks/results/<commit>.json.
+"""
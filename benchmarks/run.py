@@ -0,0 +1,304 @@
+"""
+Benchmark runner.
+
+Each benchmark builds its synthetic input once per scale (untimed) and
+returns the callable to time. Timings are the best per-call time over
+several repeats, like timeit; results are saved per commit so a later
+run can be compared against any earlier one.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from datetime import date, timedelta
+from typing import Callable, Dict
+from . import synthetic
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Production-scale input sizes; "10x" multiplies every size by ten
+PRODUCTION_SIZES = {
+    "activities": 10_000,
+    "coordinates": 5_000,
+    "weather_days": 365,
+    "events": 2_000,
+    "dataset_days": 3_650,
+}
+SCALES = {"production": 1, "10x": 10}
+
+LAST_DAY = date(2026, 3, 1)
+
+BENCHMARKS: Dict[str, Callable] = {}
+
+
+def benchmark(name: str, size_key: str):
+    """
+    Register a benchmark setup taking the input size and returning the callable to time.
+    """
+    def register(setup: Callable) -> Callable:
+        BENCHMARKS[name] = (size_key, setup)
+        return setup
+    return register
+
+
+# ---------------------------------------------------------------------
+# Garmin
+# ---------------------------------------------------------------------
+@benchmark("garmin.keep_only_runs", "activities")
+def bench_keep_only_runs(n: int) -> Callable:
+    from code.garmin.utils import keep_only_runs
+    activities = synthetic.make_activities(n)
+    return lambda: keep_only_runs(activities)
+
+
+@benchmark("garmin.calculate_weighted_training_effect", "activities")
+def bench_weighted_training_effect(n: int) -> Callable:
+    from code.garmin.utils import keep_only_runs, calculate_weighted_training_effect
+    runs = keep_only_runs(synthetic.make_activities(n))
+    return lambda: (calculate_weighted_training_effect(runs, "aerobicTrainingEffect"), calculate_weighted_training_effect(runs, "anaerobicTrainingEffect"))
+
+
+@benchmark("geo.coordinates_to_country", "coordinates")
+def bench_coordinates_to_country(n: int) -> Callable:
+    from code.garmin.geo import CountryMemo
+    coords = synthetic.make_coordinates(n)
+    # Own memo under the benchmark's working directory, never data/geo_cache.sqlite
+    memo = CountryMemo(path=os.path.abspath("geo_cache.sqlite"))
+    memo.lookup(coords)  # warm the memo, like a daily run after the first
+    return lambda: [country for country in memo.lookup(coords) if country is not None]
+
+
+@benchmark("geo.coordinates_to_countries_exact", "coordinates")
+def bench_coordinates_to_countries(n: int) -> Callable:
+    from code.garmin.geo import coordinates_to_countries
+    coords = synthetic.make_coordinates(n)
+    return lambda: coordinates_to_countries(coords)
+
+
+# ---------------------------------------------------------------------
+# Weather
+# ---------------------------------------------------------------------
+@benchmark("weather.extract_hourly_data", "weather_days")
+def bench_extract_hourly_data(n: int) -> Callable:
+    from code.weather.parsing import extract_hourly_data
+    response = synthetic.SyntheticWeatherResponse(n)
+    return lambda: [extract_hourly_data(response, 7 if i % 2 else None, i) for i in range(n)]
+
+
+@benchmark("weather.extract_daily_data", "weather_days")
+def bench_extract_daily_data(n: int) -> Callable:
+    from code.weather.parsing import extract_daily_data
+    response = synthetic.SyntheticWeatherResponse(n)
+    return lambda: [extract_daily_data(response, i) for i in range(n)]
+
+
+@benchmark("weather.extract_range", "weather_days")
+def bench_extract_range(n: int) -> Callable:
+    from code.weather.parsing import extract_hourly_range, extract_daily_range
+    response = synthetic.SyntheticWeatherResponse(n)
+    hours = [7 if i % 2 else None for i in range(n)]
+    return lambda: (extract_hourly_range(response, hours), extract_daily_range(response))
+
+
+# ---------------------------------------------------------------------
+# Calendar
+# ---------------------------------------------------------------------
+@benchmark("calendar.process_daily_events", "events")
+def bench_process_daily_events(n: int) -> Callable:
+    from code.calendar.parsing import process_daily_events
+    events = synthetic.make_events(n, LAST_DAY - timedelta(days=364), 365)
+    return lambda: process_daily_events(events)
+
+
+@benchmark("calendar.process_range_events", "events")
+def bench_process_range_events(n: int) -> Callable:
+    from code.calendar.parsing import process_range_events
+    first_day = LAST_DAY - timedelta(days=364)
+    class_events = synthetic.make_events(n // 2, first_day, 365, seed=1)
+    work_events = synthetic.make_events(n // 2, first_day, 365, seed=2)
+    return lambda: process_range_events(class_events, work_events, first_day, LAST_DAY)
+
+
+# ---------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------
+def make_storage_bench(backend_name: str, upsert: bool) -> Callable:
+    """
+    save_row against a dataset of n days, stored under the current
+    directory (the runner gives every benchmark a fresh one).
+    Appends the next day, or rewrites the day a month back.
+    """
+    def setup(n: int) -> Callable:
+        from code.pipeline.storage import get_backend
+        backend = get_backend(backend_name)
+        rows = synthetic.make_rows(n, LAST_DAY)
+        backend.save_rows(rows)
+        day = iter(range(1, 10**9))
+        template = dict(rows[-30])
+
+        def save():
+            row = dict(template)
+            if not upsert:
+                row["date"] = (LAST_DAY + timedelta(days=next(day))).isoformat()
+            backend.save_row(row)
+        return save
+    return setup
+
+
+for backend_name in ("csv", "sqlite", "parquet"):
+    benchmark(f"storage.{backend_name}.save_row_append", "dataset_days")(make_storage_bench(backend_name, upsert=False))
+    benchmark(f"storage.{backend_name}.save_row_upsert", "dataset_days")(make_storage_bench(backend_name, upsert=True))
+
+
+# ---------------------------------------------------------------------
+# Running
+# ---------------------------------------------------------------------
+def measure(func: Callable, repeat: int) -> Dict[str, float]:
+    """
+    Time func like timeit: calls per repeat are chosen so one repeat
+    takes at least 0.2 s. Returns per-call seconds.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+    return {"best": min(times), "median": statistics.median(times), "number": number, "repeat": repeat}
+
+
+def run_benchmarks(scales, pattern: str | None, repeat: int) -> Dict[str, Dict]:
+    results = {}
+    cwd = os.getcwd()
+    for scale in scales:
+        for name, (size_key, setup) in BENCHMARKS.items():
+            if pattern and pattern not in name:
+                continue
+            size = PRODUCTION_SIZES[size_key] * SCALES[scale]
+            with tempfile.TemporaryDirectory() as workdir:
+                os.chdir(workdir)
+                try:
+                    result = measure(setup(size), repeat)
+                finally:
+                    os.chdir(cwd)
+            key = f"{name}[{scale}]"
+            results[key] = result | {"size": size}
+            print(f"{key:<60} {format_seconds(result['best']):>10}  (n={size})")
+    return results
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, factor in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= factor:
+            return f"{seconds / factor:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+# ---------------------------------------------------------------------
+# Results
+# ---------------------------------------------------------------------
+def git(*args: str) -> str:
+    try:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def get_results_path(ref: str) -> str:
+    """
+    Return the results file of a commit (any git revision) or an explicit path.
+    """
+    if ref.endswith(".json"):
+        return ref
+    commit = git("rev-parse", "--short", ref) or ref
+    path = os.path.join(RESULTS_DIR, f"{commit}.json")
+    dirty_path = os.path.join(RESULTS_DIR, f"{commit}-dirty.json")
+    return path if os.path.exists(path) or not os.path.exists(dirty_path) else dirty_path
+
+
+def save_results(results: Dict[str, Dict]) -> str:
+    """
+    Save results under the current commit ("-dirty" with uncommitted changes).
+    Benchmarks of the same commit run separately are merged into one file.
+    """
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    dirty = bool(git("status", "--porcelain", "--untracked-files=no"))
+    path = os.path.join(RESULTS_DIR, f"{commit}{'-dirty' if dirty else ''}.json")
+    try:
+        with open(path) as f:
+            results = json.load(f)["results"] | results
+    except (OSError, ValueError, KeyError):
+        pass
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({
+            "commit": commit,
+            "dirty": dirty,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "results": results,
+        }, f, indent=2)
+    return path
+
+
+def compare(results: Dict[str, Dict], baseline_path: str, threshold: float) -> int:
+    """
+    Print current vs baseline timings.
+    Returns the number of benchmarks slower than baseline by more than threshold.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline['commit']} ({baseline['timestamp']}):")
+    regressions = 0
+    for key, result in results.items():
+        before = baseline["results"].get(key)
+        if before is None:
+            continue
+        ratio = result["best"] / before["best"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 / (1 + threshold):
+            flag = "  faster"
+        print(f"{key:<60} {format_seconds(before['best']):>10} -> {format_seconds(result['best']):>10}  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the pipeline micro-benchmarks.")
+    parser.add_argument("--scale", choices=[*SCALES, "all"], default="all", help="Input scale (default: all)")
+    parser.add_argument("-k", dest="pattern", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repeats per benchmark (default: 5)")
+    parser.add_argument("--compare", metavar="REF", help="Commit (or results file) to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Slowdown reported as a regression (default: 0.25)")
+    parser.add_argument("--no-save", action="store_true", help="Do not save the results")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    scales = list(SCALES) if args.scale == "all" else [args.scale]
+    results = run_benchmarks(scales, args.pattern, args.repeat)
+
+    if not args.no_save:
+        print("\nResults saved to", save_results(results))
+    if args.compare:
+        baseline_path = get_results_path(args.compare)
+        if not os.path.exists(baseline_path):
+            print(f"No saved results for {args.compare} ({baseline_path})")
+            return 2
+        return 1 if compare(results, baseline_path, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Deterministic synthetic inputs for the benchmarks.
+
+Every generator takes a size and a seed, so a benchmark sees identical
+data on every commit.
+"""
+
+import random
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List
+import numpy as np
+from code.pipeline.schema import FINAL_SCHEMA, STRING_COLUMNS, BOOLEAN_COLUMNS, INTEGER_COLUMNS
+from code.weather.constants import HOURLY_VARIABLES, DAILY_VARIABLES
+
+
+ACTIVITY_TYPES = ["running", "trail_running", "treadmill_running", "track_running", "strength_training", "cycling", "walking", "lap_swimming"]
+
+# (latitude, longitude, spread in degrees) of typical run locations
+RUN_LOCATIONS = [(53.35, -6.26, 0.2), (54.69, 25.28, 0.2), (41.99, 21.43, 0.2), (48.86, 2.35, 0.5), (40.71, -74.0, 0.5)]
+
+
+# ---------------------------------------------------------------------
+# Garmin
+# ---------------------------------------------------------------------
+def make_activities(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Activities shaped like get_activities_by_date entries, newest first.
+    """
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1, 7, 0)
+    activities = []
+    for i in range(n):
+        load = rng.uniform(0, 250)
+        activities.append({
+            "activityId": 10_000_000 + i,
+            "activityType": {"typeKey": rng.choice(ACTIVITY_TYPES)},
+            "startTimeLocal": (start - timedelta(hours=9 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+            "distance": rng.uniform(1_000, 30_000),
+            "duration": rng.uniform(900, 10_800),
+            "activityTrainingLoad": load,
+            "aerobicTrainingEffect": rng.uniform(0, 5),
+            "anaerobicTrainingEffect": rng.uniform(0, 5),
+        })
+    return activities
+
+
+def make_coordinates(n: int, seed: int = 0) -> List[tuple]:
+    """
+    Run start coordinates clustered around a few home locations.
+    """
+    rng = random.Random(seed)
+    coords = []
+    for _ in range(n):
+        lat, lon, spread = rng.choice(RUN_LOCATIONS)
+        coords.append((lat + rng.uniform(-spread, spread), lon + rng.uniform(-spread, spread)))
+    return coords
+
+
+# ---------------------------------------------------------------------
+# Open-Meteo
+# ---------------------------------------------------------------------
+class SyntheticVariable:
+    def __init__(self, values: np.ndarray):
+        self._values = values
+
+    def ValuesAsNumpy(self) -> np.ndarray:
+        return self._values
+
+    def ValuesInt64AsNumpy(self) -> np.ndarray:
+        return self._values.astype(np.int64)
+
+
+class SyntheticBlock:
+    def __init__(self, variables: List[np.ndarray]):
+        self._variables = [SyntheticVariable(values) for values in variables]
+
+    def Variables(self, index: int) -> SyntheticVariable:
+        return self._variables[index]
+
+
+class SyntheticWeatherResponse:
+    """
+    Stand-in for a decoded Open-Meteo WeatherApiResponse covering n_days,
+    exposing the Hourly()/Daily() accessors the parsers use.
+    """
+
+    def __init__(self, n_days: int, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        hours = 24 * n_days
+        hourly = [rng.normal(8, 6, hours)] + [rng.exponential(0.3, hours) for _ in range(len(HOURLY_VARIABLES) - 3)]
+        hourly += [rng.uniform(0, 40, hours), rng.choice([0, 1, 2, 3, 45, 61, 63, 80], hours).astype(float)]
+        self._hourly = SyntheticBlock([values.astype(np.float32) for values in hourly])
+
+        midnight = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp() + 86_400 * np.arange(n_days)
+        daily = [rng.choice([0, 1, 2, 3, 45, 61, 63, 80], n_days).astype(float), midnight + 7 * 3600, midnight + 19 * 3600]
+        daily += [rng.uniform(8, 16, n_days) * 3600] + [rng.normal(8, 6, n_days) for _ in range(len(DAILY_VARIABLES) - 4)]
+        self._daily = SyntheticBlock([values.astype(np.float32) if i not in (1, 2) else values for i, values in enumerate(daily)])
+
+    def Hourly(self) -> SyntheticBlock:
+        return self._hourly
+
+    def Daily(self) -> SyntheticBlock:
+        return self._daily
+
+
+# ---------------------------------------------------------------------
+# Google Calendar
+# ---------------------------------------------------------------------
+def make_events(n: int, first_day: date, n_days: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    events().list items spread over n_days, sorted by start time.
+    About one in twenty is an all-day event, some are deadlines.
+    """
+    rng = random.Random(seed)
+    events = []
+    for i in range(n):
+        day = first_day + timedelta(days=rng.randrange(n_days))
+        if rng.random() < 0.05:
+            events.append({
+                "id": f"event{i}", "summary": rng.choice(["Holiday", "Project deadline", "Exam"]),
+                "start": {"date": day.isoformat()}, "end": {"date": (day + timedelta(days=1)).isoformat()},
+            })
+            continue
+        start = datetime(day.year, day.month, day.day, rng.randrange(7, 21), rng.choice([0, 15, 30, 45]), tzinfo=timezone.utc)
+        end = start + timedelta(minutes=rng.choice([30, 45, 60, 90, 120, 180]))
+        events.append({
+            "id": f"event{i}", "summary": rng.choice(["Lecture", "Lab", "Meeting", "Assignment due", "Seminar"]),
+            "start": {"dateTime": start.isoformat()}, "end": {"dateTime": end.isoformat()},
+        })
+    return sorted(events, key=lambda event: event["start"].get("dateTime") or event["start"]["date"])
+
+
+# ---------------------------------------------------------------------
+# Dataset
+# ---------------------------------------------------------------------
+def make_row(day: date, rng: random.Random) -> Dict[str, Any]:
+    """
+    One aggregated row in FINAL_SCHEMA with plausible values.
+    """
+    row = {}
+    for column in FINAL_SCHEMA:
+        if column in BOOLEAN_COLUMNS:
+            row[column] = rng.random() < 0.5
+        elif column in STRING_COLUMNS:
+            row[column] = f"{column[:8]}_{rng.randrange(20)}"
+        elif column in INTEGER_COLUMNS:
+            row[column] = rng.randrange(100)
+        else:
+            row[column] = round(rng.uniform(0, 100), 1)
+    row["date"] = day.isoformat()
+    row["day_of_the_week"] = day.strftime("%A")
+    row["run_today_start_time"] = f"{rng.randrange(6, 20):02d}:{rng.randrange(60):02d}:00"
+    row["location_coordinates"] = str((53.35 + rng.uniform(-0.1, 0.1), -6.26 + rng.uniform(-0.1, 0.1)))
+    return row
+
+
+def make_rows(n: int, last_day: date, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    n consecutive daily rows ending on last_day.
+    """
+    rng = random.Random(seed)
+    return [make_row(last_day - timedelta(days=n - 1 - i), rng) for i in range(n)]
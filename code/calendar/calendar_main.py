@@ -1,6 +1,9 @@
 """
 Calendar data extraction entry point.
 
+Events are read from a local store kept current with incremental
+sync (see store.py).
+
 Fetches:
 - Class hours today
 - Work hours today
@@ -8,70 +11,151 @@ Fetches:
 - Upcoming deadlines within 3 days
 """
 
-from typing import Any, Dict, List
+import json
+import os
+from datetime import date
+from typing import Any, Dict, List, Tuple
 from googleapiclient.errors import HttpError
-from .client import build_calendar_service
-from .constants import CLASS_CALENDAR_NAME, WORK_CALENDAR_NAME
-from .parsing import get_today_window, get_next_three_days_window, process_daily_events, is_deadline, get_gym_availability
-
-
-def get_calendar_id(service, calendar_name) -> str | None:
+from code.replay import get_state_path
+from code.tracing import traced
+from .client import build_calendar_service, execute_request
+from .constants import CLASS_CALENDAR_NAME, WORK_CALENDAR_NAME, CALENDAR_IDS_CACHE_PATH
+from .store import get_event_store, sync_calendars
+from .parsing import get_day_start, get_today_window, get_next_three_days_window, process_range_events
+
+
+# ---------------------------------------------------------------------
+# Calendar IDs
+# ---------------------------------------------------------------------
+def load_calendar_ids() -> Dict[str, str]:
     """
-    Retrieve calendar ID by calendar name.
+    Load the cached calendar name -> ID map.
     """
-    calendars = service.calendarList().list().execute()
-    for calendar in calendars["items"]:
-        if calendar_name == calendar["summary"]:
-            return calendar["id"]
-    return None
+    try:
+        with open(get_state_path(CALENDAR_IDS_CACHE_PATH)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
 
+def save_calendar_ids(calendar_ids: Dict[str, str]) -> None:
+    path = get_state_path(CALENDAR_IDS_CACHE_PATH)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(calendar_ids, f, indent=2)
+    os.replace(tmp_path, path)
 
-def get_events(service, calendar_id, start, end) -> List[Dict[str, Any]]:
+
+def list_calendar_ids(service) -> Dict[str, str]:
+    """
+    Map every calendar name on the account to its ID, following pagination.
     """
-    Fetch events within a time window.
+    calendar_ids = {}
+    page_token = None
+    while True:
+        calendars = execute_request(service.calendarList().list(pageToken=page_token), "calendarList.list")
+        for calendar in calendars.get("items", []):
+            calendar_ids.setdefault(calendar["summary"], calendar["id"])
+        page_token = calendars.get("nextPageToken")
+        if not page_token:
+            return calendar_ids
+
+
+def get_calendar_id(service, calendar_name, refresh: bool = False) -> str | None:
     """
-    events = (
-        service.events()
-        .list(calendarId=calendar_id, timeMin=start, timeMax=end, singleEvents=True, orderBy="startTime")
-        .execute()
-        .get("items", [])
-    )
-    return events
+    Retrieve calendar ID by calendar name.
+    IDs come from the on-disk cache; the calendar list is fetched
+    (and the cache rewritten) only on a miss or when refresh is set.
+    """
+    calendar_ids = {} if refresh else load_calendar_ids()
+    if calendar_name not in calendar_ids:
+        calendar_ids = list_calendar_ids(service)
+        save_calendar_ids(calendar_ids)
+    return calendar_ids.get(calendar_name)
 
 
-def extract_calendar_stats() -> Dict[str, Any]:
+def get_required_calendar_ids(service, refresh: bool = False) -> tuple:
     """
-    Extract structured calendar metrics.
+    Resolve the class and work calendar IDs.
     """
-    service = build_calendar_service()
-
-    class_calendar_id = get_calendar_id(service, CLASS_CALENDAR_NAME)
+    class_calendar_id = get_calendar_id(service, CLASS_CALENDAR_NAME, refresh)
     work_calendar_id = get_calendar_id(service, WORK_CALENDAR_NAME)
 
     if not class_calendar_id or not work_calendar_id:
         raise ValueError("Required calendars not found.")
 
-    start, end = get_today_window()
-    classes_today = get_events(service, class_calendar_id, start, end)
-    work_today = get_events(service, work_calendar_id, start, end)
+    return class_calendar_id, work_calendar_id
+
+
+# ---------------------------------------------------------------------
+# Events
+# ---------------------------------------------------------------------
+def get_calendar_events(service, start: str, end: str, sync: bool = True) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Return class and work events for [start, end) from the local event store.
+    With sync, the store is first brought up to date incrementally; a 404
+    means a cached calendar ID went stale, and the IDs are re-resolved once.
+    Without sync (or if syncing fails after an earlier sync), no API calls are made.
+    """
+    store = get_event_store()
+    if not sync:
+        calendar_ids = load_calendar_ids()
+        class_calendar_id, work_calendar_id = calendar_ids.get(CLASS_CALENDAR_NAME), calendar_ids.get(WORK_CALENDAR_NAME)
+        if not class_calendar_id or not work_calendar_id:
+            raise ValueError("Required calendars not found.")
+    else:
+        for refresh in (False, True):
+            class_calendar_id, work_calendar_id = get_required_calendar_ids(service, refresh)
+            try:
+                sync_calendars(service, [class_calendar_id, work_calendar_id], store)
+                break
+            except HttpError as e:
+                if not refresh and getattr(e.resp, "status", None) == 404:
+                    continue
+                if not all(store.get_sync_token(calendar_id) for calendar_id in (class_calendar_id, work_calendar_id)):
+                    raise
+                print("Calendar sync failed, using stored events -", e)
+                break
+
+    return store.query(class_calendar_id, start, end), store.query(work_calendar_id, start, end)
+
+
+# ---------------------------------------------------------------------
+# Stats
+# ---------------------------------------------------------------------
+@traced(category="calendar")
+def extract_calendar_stats(day: date | None = None, sync: bool = True) -> Dict[str, Any]:
+    """
+    Extract structured calendar metrics.
+    Today's windows are covered by the three-day deadline window, so
+    one store query over it serves every metric. The day is computed
+    like one day of extract_calendar_range (events split at midnight).
+    """
+    service = build_calendar_service() if sync else None
+    start, end = get_next_three_days_window(day)
+    class_events, work_events = get_calendar_events(service, start, end, sync)
+    day = get_day_start(day).date()
+    return process_range_events(class_events, work_events, day, day)[day]
 
-    classes_stats = process_daily_events(classes_today)
-    work_stats = process_daily_events(work_today)
 
-    deadlines_start, deadlines_end = get_next_three_days_window()
-    events_next_three_days = get_events(service, work_calendar_id, deadlines_start, deadlines_end)
-    upcoming_deadlines = [event for event in events_next_three_days if is_deadline(event)]
+@traced(category="calendar")
+def extract_calendar_range(days: List[date], sync: bool = True) -> Dict[date, Dict[str, Any]]:
+    """
+    Extract calendar metrics for many days with one ranged store query per calendar.
+    Features for the whole range are computed in a single pass over the events
+    (days are UTC, like the single-day windows).
+    """
+    service = build_calendar_service() if sync else None
+    range_start, _ = get_today_window(min(days))
+    _, range_end = get_next_three_days_window(max(days))
+    class_events, work_events = get_calendar_events(service, range_start, range_end, sync)
 
-    return {
-        "class_hours": classes_stats["duration_sum"],
-        "work_hours": work_stats["duration_sum"],
-        "before_10am": classes_stats["morning_activity"] or work_stats["morning_activity"],
-        "after_5pm": classes_stats["evening_activity"] or work_stats["evening_activity"],
-        "upcoming_deadline_next_three_days": len(upcoming_deadlines) > 0,
-        "gym_available": get_gym_availability()
-    }
+    stats = process_range_events(class_events, work_events, min(days), max(days))
+    return {day: stats[day] for day in days}
 
 
+@traced("calendar_main", category="calendar")
 def main():
     """
     Entry point for standalone execution.
@@ -2,20 +2,58 @@
 Google Calendar API constants and configuration.
 """
 
+import hashlib
 import os
+from typing import Any, Dict, Tuple
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
-from .constants import SCOPES
+from googleapiclient.discovery_cache.base import Cache
+from code.replay import get_replay_mode, get_fixture_store, get_replay_conditions
+from code.tracing import traced, span, record_payload
+from .constants import SCOPES, DISCOVERY_CACHE_DIR
 
 
+class DiscoveryFileCache(Cache):
+    """
+    Keep fetched discovery documents on disk, so the client is built
+    without a discovery round trip after the first run.
+    """
+
+    def __init__(self, cache_dir: str = DISCOVERY_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+    def get(self, url):
+        try:
+            with open(self._path(url)) as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def set(self, url, content):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self._path(url) + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(content)
+        os.replace(tmp_path, self._path(url))
+
+
+@traced("calendar.build_service", category="api")
 def build_calendar_service():
     """
     Authenticate and return a Google Calendar service client.
     Returns:
         Resource: Authenticated Google Calendar API service
     """
+    mode = get_replay_mode()
+    if mode == "replay":
+        from code.replay.google_calendar import ReplayCalendar
+        return ReplayCalendar(get_fixture_store("calendar"), get_replay_conditions())
+
     creds = None
     # The file token.json stores the user's access and refresh tokens, and is
     # created automatically when the authorization flow completes for the first time.
@@ -32,5 +70,45 @@ def build_calendar_service():
         with open("token.json", "w") as token:
             token.write(creds.to_json())
 
-    service = build("calendar", "v3", credentials=creds)
-    return service
\ No newline at end of file
+    # Clients with bundled (static) discovery documents never hit the
+    # network for discovery; older ones fall back to the file cache.
+    service = build("calendar", "v3", credentials=creds, cache=DiscoveryFileCache())
+    if mode == "record":
+        from code.replay.google_calendar import RecordingCalendar
+        return RecordingCalendar(service, get_fixture_store("calendar"))
+    return service
+
+
+def execute_request(request, name: str) -> Any:
+    """
+    Execute one API request, traced with its URI and response size.
+    """
+    with span(f"calendar.{name}", uri=getattr(request, "uri", None)):
+        response = request.execute()
+        record_payload(response)
+    return response
+
+
+def execute_batch(service, requests: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+    """
+    Execute several API requests as one batched HTTP request.
+    Returns:
+        (responses by key, errors by key)
+    """
+    responses: Dict[str, Any] = {}
+    errors: Dict[str, Exception] = {}
+
+    def collect(request_id, response, exception):
+        if exception is not None:
+            errors[request_id] = exception
+        else:
+            responses[request_id] = response
+
+    batch = service.new_batch_http_request(callback=collect)
+    for key, request in requests.items():
+        batch.add(request, request_id=key)
+    with span("calendar.batch", requests=len(requests)) as args:
+        batch.execute()
+        record_payload(responses)
+        args["errors"] = len(errors)
+    return responses, errors
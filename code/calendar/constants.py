@@ -2,6 +2,8 @@
 Google Calendar API constants and configuration.
 """
 
+import os
+
 # If modifying these scopes, delete the file token.json.
 SCOPES = ["https://www.googleapis.com/auth/calendar.readonly"]
 
@@ -33,4 +35,15 @@ GYM_AVAILABLE = {
 }
 
 CLASS_CALENDAR_NAME = "KTU Classes"
-WORK_CALENDAR_NAME = "Meetings / Activities"
\ No newline at end of file
+WORK_CALENDAR_NAME = "Meetings / Activities"
+
+# ---------------------------------------------------------------------
+# Local Caches
+# ---------------------------------------------------------------------
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data")
+# Calendar name -> ID map, refreshed whenever a name or ID stops resolving
+CALENDAR_IDS_CACHE_PATH = os.getenv("CALENDAR_IDS_CACHE_PATH", os.path.join(DATA_DIR, "calendar_ids.json"))
+# Discovery documents fetched by googleapiclient
+DISCOVERY_CACHE_DIR = os.getenv("DISCOVERY_CACHE_DIR", os.path.join(DATA_DIR, "discovery_cache"))
+# Local copy of calendar events, kept current with incremental sync
+CALENDAR_STORE_PATH = os.getenv("CALENDAR_STORE_PATH", os.path.join(DATA_DIR, "calendar_events.sqlite"))
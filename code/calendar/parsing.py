@@ -2,15 +2,16 @@
 Calendar data extraction and processing helpers.
 """
 
-from datetime import datetime, timedelta, timezone
+import math
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
 from typing import Any, Dict, List, Tuple
 from dateutil import parser
 from .constants import DEADLINE_KEYWORDS, GYM_AVAILABLE
 from code.garmin.utils import get_weekday_name, get_today_date
 
 
-def get_gym_availability():
-    return GYM_AVAILABLE[get_weekday_name(get_today_date())]
+def get_gym_availability(day: date | None = None):
+    return GYM_AVAILABLE[get_weekday_name(day or get_today_date())]
 
 
 def is_deadline(event: Dict[str, Any]) -> bool:
@@ -21,26 +22,43 @@ def is_deadline(event: Dict[str, Any]) -> bool:
     return any(keyword in summary for keyword in DEADLINE_KEYWORDS)
 
 
-def get_today_window() -> Tuple[str, str]:
+def get_day_start(day: date | None = None) -> datetime:
     """
-    Return ISO timestamps for today's UTC window.
+    Return UTC midnight of the given day (default: today in UTC).
     """
-    now = datetime.now(timezone.utc)
-    start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return datetime.combine(day or get_today_date(timezone.utc), time.min, tzinfo=timezone.utc)
+
+
+def get_today_window(day: date | None = None) -> Tuple[str, str]:
+    """
+    Return ISO timestamps for today's (or the given day's) UTC window.
+    """
+    start = get_day_start(day)
     end = start + timedelta(days=1)
     return start.isoformat(), end.isoformat()
 
 
-def get_next_three_days_window() -> Tuple[str, str]:
+def get_next_three_days_window(day: date | None = None) -> Tuple[str, str]:
     """
     Return ISO timestamps for the next 3-day UTC window.
     """
-    now = datetime.now(timezone.utc)
-    start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    start = get_day_start(day)
     end = start + timedelta(days=3)
     return start.isoformat(), end.isoformat()
 
 
+def get_event_bounds(event: Dict[str, Any]) -> Tuple[datetime, datetime]:
+    """
+    Return the (start, end) of an event as timezone-aware datetimes.
+    All-day events are interpreted as UTC midnights.
+    """
+    def parse(value):
+        if "dateTime" in value:
+            return parser.isoparse(value["dateTime"])
+        return datetime.combine(date.fromisoformat(value["date"]), time.min, tzinfo=timezone.utc)
+    return parse(event["start"]), parse(event["end"])
+
+
 def process_daily_events(events: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Aggregate duration and time-of-day activity flags.
@@ -61,7 +79,7 @@ def process_daily_events(events: List[Dict[str, Any]]) -> Dict[str, Any]:
         start = parser.isoparse(event["start"]["dateTime"])
         end = parser.isoparse(event["end"]["dateTime"])
 
-        duration = round((end - start).total_seconds() / 3600.0, 1)
+        duration += round((end - start).total_seconds() / 3600.0, 1)
 
         if start.hour < 10:
             before_10am = True
@@ -69,7 +87,120 @@ def process_daily_events(events: List[Dict[str, Any]]) -> Dict[str, Any]:
             after_5pm = True
 
     return {
-        "duration_sum": duration,
+        "duration_sum": round(duration, 1),
         "morning_activity": before_10am,
         "evening_activity": after_5pm
-    }
\ No newline at end of file
+    }
+
+
+# ---------------------------------------------------------------------
+# Multi-day Features
+# ---------------------------------------------------------------------
+SECONDS_PER_DAY = 86400
+
+
+def parse_event_intervals(events: List[Dict[str, Any]]) -> Dict[str, list]:
+    """
+    Parse events once into parallel arrays:
+        start, end: POSIX timestamps
+        timed: False for all-day events
+        start_hour: hour of the start in the event's own timezone
+        deadline: is_deadline(event)
+    """
+    intervals = {"start": [], "end": [], "timed": [], "start_hour": [], "deadline": []}
+    for event in events:
+        start, end = get_event_bounds(event)
+        intervals["start"].append(start.timestamp())
+        intervals["end"].append(end.timestamp())
+        intervals["timed"].append("dateTime" in event["start"])
+        intervals["start_hour"].append(start.hour)
+        intervals["deadline"].append(is_deadline(event))
+    return intervals
+
+
+def split_by_day(start: float, end: float, origin: float, n_days: int):
+    """
+    Yield (day index, segment start, segment end) for the parts of
+    [start, end) falling on days 0..n_days-1 counted from origin.
+    """
+    first = max(0, math.floor((start - origin) / SECONDS_PER_DAY))
+    last = min(n_days - 1, math.ceil((end - origin) / SECONDS_PER_DAY) - 1)
+    for day in range(first, last + 1):
+        day_start = origin + day * SECONDS_PER_DAY
+        segment_start, segment_end = max(start, day_start), min(end, day_start + SECONDS_PER_DAY)
+        if segment_end > segment_start:
+            yield day, segment_start, segment_end
+
+
+def process_range_events(class_events: List[Dict[str, Any]], work_events: List[Dict[str, Any]], first_day: date, last_day: date, tz: tzinfo = timezone.utc) -> Dict[date, Dict[str, Any]]:
+    """
+    Compute calendar features for every day in [first_day, last_day]
+    from event lists spanning the whole range, in time linear in the
+    number of events and days.
+
+    Days are midnights in tz; events crossing midnight are split, and
+    each day only counts its own part. Per day:
+        - class_hours / work_hours: summed event durations
+        - busy_hours: union of class and work time (overlaps merged)
+        - before_10am / after_5pm: an event starts before 10:00 / after 17:59
+        - upcoming_deadline_next_three_days: a deadline work event
+          overlaps the day or the two following it
+        - gym_available
+    All-day events only count towards deadlines.
+    """
+    n_days = (last_day - first_day).days + 1
+    origin = datetime.combine(first_day, time.min, tzinfo=tz).timestamp()
+    hours = {"class": [0.0] * n_days, "work": [0.0] * n_days}
+    morning, evening = [False] * n_days, [False] * n_days
+    deadline_delta = [0] * (n_days + 1)
+    segments = []
+
+    for kind, events in (("class", class_events), ("work", work_events)):
+        intervals = parse_event_intervals(events)
+        for start, end, timed, start_hour, deadline in zip(*intervals.values()):
+            if kind == "work" and deadline:
+                # Days d whose window [d, d + 3) overlaps the event
+                lo = max(0, math.floor((start - origin) / SECONDS_PER_DAY) - 2)
+                hi = min(n_days - 1, math.ceil((end - origin) / SECONDS_PER_DAY) - 1)
+                if lo <= hi:
+                    deadline_delta[lo] += 1
+                    deadline_delta[hi + 1] -= 1
+            if not timed:
+                continue
+
+            start_day = math.floor((start - origin) / SECONDS_PER_DAY)
+            if 0 <= start_day < n_days:
+                morning[start_day] |= start_hour < 10
+                evening[start_day] |= start_hour > 17
+            for day, segment_start, segment_end in split_by_day(start, end, origin, n_days):
+                hours[kind][day] += round((segment_end - segment_start) / 3600.0, 1)
+                segments.append((segment_start, segment_end, day))
+
+    # One sorted sweep merges overlapping segments into busy time
+    busy = [0.0] * n_days
+    current = None
+    for segment_start, segment_end, day in sorted(segments):
+        if current and current[2] == day and segment_start <= current[1]:
+            current[1] = max(current[1], segment_end)
+            continue
+        if current:
+            busy[current[2]] += current[1] - current[0]
+        current = [segment_start, segment_end, day]
+    if current:
+        busy[current[2]] += current[1] - current[0]
+
+    stats = {}
+    deadlines_open = 0
+    for i in range(n_days):
+        day = first_day + timedelta(days=i)
+        deadlines_open += deadline_delta[i]
+        stats[day] = {
+            "class_hours": round(hours["class"][i], 1),
+            "work_hours": round(hours["work"][i], 1),
+            "busy_hours": round(busy[i] / 3600.0, 1),
+            "before_10am": morning[i],
+            "after_5pm": evening[i],
+            "upcoming_deadline_next_three_days": deadlines_open > 0,
+            "gym_available": get_gym_availability(day),
+        }
+    return stats
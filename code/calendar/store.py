@@ -0,0 +1,146 @@
+"""
+Local calendar event store with incremental sync.
+
+Events of each calendar are mirrored into SQLite. The first sync lists
+the whole calendar; later syncs send the stored syncToken and only
+receive events that changed since (cancelled events are removed).
+A 410 response means the token expired, and triggers a full resync.
+
+Feature extraction then queries the store for any window, so
+historical days need no API calls.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+from dateutil import parser
+from googleapiclient.errors import HttpError
+from code.replay import get_state_path
+from .client import execute_batch, execute_request
+from .constants import CALENDAR_STORE_PATH
+from .parsing import get_event_bounds
+
+
+_EVENT_STORE: "EventStore | None" = None
+
+
+class EventStore:
+    """
+    SQLite copy of calendar events, with one sync token per calendar.
+    """
+
+    def __init__(self, path: str = CALENDAR_STORE_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            "calendar_id TEXT NOT NULL, event_id TEXT NOT NULL, "
+            "start_ts REAL NOT NULL, end_ts REAL NOT NULL, payload TEXT NOT NULL, "
+            "PRIMARY KEY (calendar_id, event_id))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS events_by_start ON events (calendar_id, start_ts)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sync_state ("
+            "calendar_id TEXT PRIMARY KEY, sync_token TEXT NOT NULL, synced_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_sync_token(self, calendar_id: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT sync_token FROM sync_state WHERE calendar_id = ?", (calendar_id,)).fetchone()
+        return row[0] if row else None
+
+    def apply(self, calendar_id: str, events: List[Dict[str, Any]], sync_token: str, full: bool) -> None:
+        """
+        Apply one sync result atomically, together with its new sync token.
+        A full sync replaces everything stored for the calendar.
+        """
+        with self._lock, self._conn:
+            if full:
+                self._conn.execute("DELETE FROM events WHERE calendar_id = ?", (calendar_id,))
+            for event in events:
+                if event.get("status") == "cancelled":
+                    self._conn.execute("DELETE FROM events WHERE calendar_id = ? AND event_id = ?", (calendar_id, event["id"]))
+                    continue
+                start, end = get_event_bounds(event)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO events (calendar_id, event_id, start_ts, end_ts, payload) VALUES (?, ?, ?, ?, ?)",
+                    (calendar_id, event["id"], start.timestamp(), end.timestamp(), json.dumps(event)),
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (calendar_id, sync_token, synced_at) VALUES (?, ?, ?)",
+                (calendar_id, sync_token, time.time()),
+            )
+
+    def query(self, calendar_id: str, start: str, end: str) -> List[Dict[str, Any]]:
+        """
+        Return stored events overlapping [start, end), ordered by start time
+        (same semantics as an events().list timeMin/timeMax query).
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM events WHERE calendar_id = ? AND start_ts < ? AND end_ts > ? ORDER BY start_ts",
+                (calendar_id, parser.isoparse(end).timestamp(), parser.isoparse(start).timestamp()),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+
+def get_event_store() -> EventStore:
+    """
+    Return the process-wide event store.
+    """
+    global _EVENT_STORE
+    if _EVENT_STORE is None:
+        _EVENT_STORE = EventStore(get_state_path(CALENDAR_STORE_PATH))
+    return _EVENT_STORE
+
+
+# ---------------------------------------------------------------------
+# Sync
+# ---------------------------------------------------------------------
+def list_changes_request(service, calendar_id: str, sync_token: str | None = None, page_token: str | None = None):
+    """
+    Build an events().list request for a full (no token) or incremental sync.
+    """
+    return service.events().list(calendarId=calendar_id, singleEvents=True, syncToken=sync_token, pageToken=page_token)
+
+
+def collect_pages(service, calendar_id: str, sync_token: str | None, response: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    Follow pagination from a first response.
+    Returns:
+        (all changed events, next sync token)
+    """
+    events = list(response.get("items", []))
+    while response.get("nextPageToken"):
+        response = execute_request(list_changes_request(service, calendar_id, sync_token, response["nextPageToken"]), "events.list")
+        events.extend(response.get("items", []))
+    return events, response["nextSyncToken"]
+
+
+def sync_calendars(service, calendar_ids: List[str], store: EventStore | None = None) -> None:
+    """
+    Bring the store up to date for several calendars.
+    The first page of every calendar is requested in one batched HTTP request.
+    """
+    store = store or get_event_store()
+    tokens = {calendar_id: store.get_sync_token(calendar_id) for calendar_id in calendar_ids}
+    responses, errors = execute_batch(service, {
+        calendar_id: list_changes_request(service, calendar_id, token) for calendar_id, token in tokens.items()
+    })
+
+    for calendar_id, token in tokens.items():
+        if calendar_id in errors:
+            error = errors[calendar_id]
+            if token is None or not isinstance(error, HttpError) or getattr(error.resp, "status", None) != 410:
+                raise error
+            # Sync token expired: start over with a full sync
+            token = None
+            response = execute_request(list_changes_request(service, calendar_id), "events.list")
+        else:
+            response = responses[calendar_id]
+
+        events, next_token = collect_pages(service, calendar_id, token, response)
+        store.apply(calendar_id, events, next_token, full=token is None)
@@ -0,0 +1,146 @@
+"""
+Persistent response cache for the Garmin client.
+
+Wellness data for past days and activity details never change once
+synced, so they are stored permanently in SQLite and keyed by
+(endpoint, date/activityId). Responses for today, and empty responses
+(the watch may not have synced yet), expire after a short TTL.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import date
+from functools import wraps
+from typing import Any, Callable, Dict
+from garminconnect import Garmin
+from code.tracing import annotate, trace_call
+from .config import GARMIN_CACHE_PATH, GARMIN_CACHE_TODAY_TTL
+from .utils import get_today_date
+
+
+# Endpoints whose first argument is a calendar date
+DATE_KEYED_ENDPOINTS = {"get_sleep_data", "get_hrv_data", "get_rhr_day", "get_training_status"}
+# Endpoints whose first argument is an activity ID
+ID_KEYED_ENDPOINTS = {"get_activity_details"}
+
+
+def is_permanent(endpoint: str, key: str, payload: Any) -> bool:
+    """
+    Decide whether a response can be cached without expiry.
+    """
+    if not payload:
+        return False
+    if endpoint in ID_KEYED_ENDPOINTS:
+        return True
+    try:
+        return date.fromisoformat(key) < get_today_date()
+    except ValueError:
+        return False
+
+
+class CachedGarmin:
+    """
+    Caching proxy around an authenticated Garmin client.
+
+    Cached endpoints are served from SQLite when possible; every other
+    attribute is delegated to the wrapped client unchanged.
+    """
+
+    def __init__(self, api: Garmin, path: str = GARMIN_CACHE_PATH, today_ttl: float = GARMIN_CACHE_TODAY_TTL):
+        self._api = api
+        self._today_ttl = today_ttl
+        self._lock = threading.Lock()
+        self._stats: Counter = Counter()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "endpoint TEXT NOT NULL, key TEXT NOT NULL, payload TEXT, "
+            "fetched_at REAL NOT NULL, permanent INTEGER NOT NULL, "
+            "PRIMARY KEY (endpoint, key))"
+        )
+        self._conn.commit()
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._api, name)
+        if name in DATE_KEYED_ENDPOINTS or name in ID_KEYED_ENDPOINTS:
+            return trace_call(f"garmin.{name}", self._cached(name, attr))
+        if callable(attr) and not name.startswith("_"):
+            return trace_call(f"garmin.{name}", attr)
+        return attr
+
+    # -----------------------------------------------------------------
+    # Cache access
+    # -----------------------------------------------------------------
+    def get(self, endpoint: str, key: str) -> tuple:
+        """
+        Look up a cached response.
+        Returns (found, payload); expired entries count as not found.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, fetched_at, permanent FROM responses WHERE endpoint = ? AND key = ?",
+                (endpoint, key),
+            ).fetchone()
+        if row is None:
+            self._count(endpoint, "misses")
+            return False, None
+        payload, fetched_at, permanent = row
+        if not permanent and time.time() - fetched_at > self._today_ttl:
+            self._count(endpoint, "expired")
+            return False, None
+        self._count(endpoint, "hits")
+        return True, json.loads(payload)
+
+    def put(self, endpoint: str, key: str, payload: Any) -> None:
+        """
+        Store a response, marking it permanent when it can never change.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (endpoint, key, payload, fetched_at, permanent) VALUES (?, ?, ?, ?, ?)",
+                (endpoint, key, json.dumps(payload), time.time(), int(is_permanent(endpoint, key, payload))),
+            )
+            self._conn.commit()
+
+    def _cached(self, endpoint: str, method: Callable) -> Callable:
+        @wraps(method)
+        def call(key, *args, **kwargs):
+            key = str(key)
+            found, payload = self.get(endpoint, key)
+            annotate(cache="hit" if found else "miss")
+            if found:
+                return payload
+            payload = method(key, *args, **kwargs)
+            self.put(endpoint, key, payload)
+            return payload
+        return call
+
+    # -----------------------------------------------------------------
+    # Statistics
+    # -----------------------------------------------------------------
+    def _count(self, endpoint: str, outcome: str) -> None:
+        with self._lock:
+            self._stats[(endpoint, outcome)] += 1
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Return hit/miss/expired counts per endpoint for this process.
+        """
+        with self._lock:
+            stats: Dict[str, Dict[str, int]] = {}
+            for (endpoint, outcome), count in self._stats.items():
+                stats.setdefault(endpoint, {"hits": 0, "misses": 0, "expired": 0})[outcome] = count
+        return stats
+
+    def cache_summary(self) -> str:
+        """
+        Return a one-line summary of cache usage.
+        """
+        totals: Counter = Counter()
+        for counts in self.cache_stats().values():
+            totals.update(counts)
+        calls = totals["misses"] + totals["expired"]
+        return f"{totals['hits']} cached, {calls} fetched"
@@ -4,24 +4,21 @@ Global configuration and shared constants.
 
 import os
 import logging
-import geopandas as gpd
 
 
 # Suppress verbose garminconnect logging
 logging.getLogger("garminconnect").setLevel(logging.CRITICAL)
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-SHAPEFILE_PATH = os.path.join(BASE_DIR, "..", "..", "data", "ne_110m_admin_0_countries", "ne_110m_admin_0_countries.shp")
-
-
-# ---------------------------------------------------------------------
-# Geospatial Data
-# ---------------------------------------------------------------------
-try:
-    WORLD = gpd.read_file(SHAPEFILE_PATH)
-except Exception as e:
-    print("World shapefile could not be loaded:", e)
-    WORLD = None
+DATA_DIR = os.path.join(BASE_DIR, "..", "..", "data")
+SHAPEFILE_PATH = os.path.join(DATA_DIR, "ne_110m_admin_0_countries", "ne_110m_admin_0_countries.shp")
+# Precompiled WKB/array copy of the shapefile, loadable without geopandas.
+# Regenerate with `python -m code.garmin.geo` after replacing the shapefile.
+COUNTRY_CACHE_DIR = os.path.join(DATA_DIR, "ne_110m_admin_0_countries_wkb")
+# Grid cell size (degrees) for the memoized country lookup, ~1 km at 0.01
+GEO_CELL_DEGREES = float(os.getenv("GEO_CELL_DEGREES", "0.01"))
+GEO_MEMO_SIZE = 4096
+GEO_CACHE_PATH = os.getenv("GEO_CACHE_PATH", os.path.join(DATA_DIR, "geo_cache.sqlite"))
 
 
 # ---------------------------------------------------------------------
@@ -35,4 +32,54 @@ DAYS_OF_THE_WEEK = {
     4: "Friday",
     5: "Saturday",
     6: "Sunday",
-}
\ No newline at end of file
+}
+
+
+# ---------------------------------------------------------------------
+# Wellness Fetching
+# ---------------------------------------------------------------------
+# Concurrent per-day requests against Garmin wellness endpoints
+WELLNESS_MAX_WORKERS = int(os.getenv("GARMIN_MAX_WORKERS", "8"))
+# Longest span (days) requested from one range wellness endpoint call
+WELLNESS_RANGE_DAYS = 28
+
+
+# ---------------------------------------------------------------------
+# Rate Limiting
+# ---------------------------------------------------------------------
+# Sustained request rate shared by every Garmin request in the process
+GARMIN_RATE_PER_SECOND = float(os.getenv("GARMIN_RATE_PER_SECOND", "2.0"))
+# Requests that may be sent back to back before the rate applies
+GARMIN_RATE_BURST = 4
+# Floor for the rate after repeated 429/503 responses
+GARMIN_MIN_RATE = 0.2
+# Retries for a single request after a 429/503 before giving up on it
+GARMIN_MAX_RETRIES = 3
+# Pause applied to all callers after a 429/503 without a Retry-After header
+GARMIN_BACKOFF_SECONDS = 5.0
+
+
+# ---------------------------------------------------------------------
+# Response Cache
+# ---------------------------------------------------------------------
+GARMIN_CACHE_PATH = os.getenv("GARMIN_CACHE_PATH", os.path.join(DATA_DIR, "garmin_cache.sqlite"))
+# Seconds a response for today (or an empty response) stays valid
+GARMIN_CACHE_TODAY_TTL = 15 * 60
+
+
+# ---------------------------------------------------------------------
+# Rolling Window State
+# ---------------------------------------------------------------------
+ROLLING_STATE_PATH = os.getenv("ROLLING_STATE_PATH", os.path.join(DATA_DIR, "rolling_state.json"))
+# Past days re-applied from the activity snapshot on every run (late syncs)
+ROLLING_REFRESH_DAYS = 7
+
+
+# ---------------------------------------------------------------------
+# Session
+# ---------------------------------------------------------------------
+GARMIN_TOKENSTORE = os.getenv("GARMINTOKENS", "~/.garminconnect")
+# Keep-alive connections kept open to Garmin Connect (covers the wellness fan-out)
+GARMIN_POOL_SIZE = int(os.getenv("GARMIN_POOL_SIZE", str(max(10, WELLNESS_MAX_WORKERS * 2))))
+# Seconds before OAuth2 expiry at which the token is refreshed in the background
+GARMIN_TOKEN_REFRESH_MARGIN = 10 * 60
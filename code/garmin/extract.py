@@ -6,17 +6,25 @@ days since different previous activities,
 and location information
 """
 
-from datetime import timedelta, datetime
+from datetime import date, timedelta
 from typing import Any, Dict
 from garminconnect import Garmin
-from .utils import get_today_date, get_last_monday, get_monday_four_weeks_ago, get_weekday_name, get_total_run_statistic, keep_only_runs, calculate_weighted_training_effect
+from code.pipeline.dag import Stage, run_stages
+from code.tracing import traced
+from .config import ROLLING_REFRESH_DAYS
+from .utils import get_today_date, get_last_monday, get_monday_four_weeks_ago, get_weekday_name, get_total_run_statistic, keep_only_runs, calculate_weighted_training_effect, round_or_none
 from .geo import coordinates_to_country, find_trip
+from .snapshot import ActivitySnapshot
+from .wellness import fetch_day, parse_hrv, parse_sleep_score, parse_rhr, parse_training_status
+from .ratelimit import GARMIN_REQUEST_ERRORS
+from .rolling import RollingWindow, build_day_record
 
 
 # ---------------------------------------------------------------------
 # Daily Metrics
 # ---------------------------------------------------------------------
-def extract_daily_stats(api: Garmin) -> Dict[str, Any]:
+@traced(category="garmin")
+def extract_daily_stats(api: Garmin, snapshot: ActivitySnapshot | None = None, day: date | None = None) -> Dict[str, Any]:
     """
     Extract today's recovery and weekly running metrics.
     Includes:
@@ -27,46 +35,27 @@ def extract_daily_stats(api: Garmin) -> Dict[str, Any]:
         - Total kilometers run this week
     Returns:
         Dictionary containing daily health and weekly mileage metrics.
-    All fields default to None or 0 if API calls fail.
+    Metrics that cannot be fetched are None.
     """
-    today = get_today_date().isoformat()
-    last_monday = get_last_monday().isoformat()
+    day = day or get_today_date()
+    snapshot = snapshot or ActivitySnapshot.fetch(api, get_last_monday(day), day)
+    today = day.isoformat()
 
-    try:
-        training_status_data = api.get_training_status(today)
-        training_status = training_status_data.get("mostRecentTrainingStatus", {}).get("latestTrainingStatusData", {}).get("3601168031", {}).get("trainingStatusFeedbackPhrase")
-    except Exception:
-        training_status = None
-
-    try:
-        hrv = api.get_hrv_data(today).get("hrvSummary", {}).get("lastNightAvg")
-    except Exception:
-        hrv = None
+    training_status = fetch_day(api.get_training_status, parse_training_status, day)
+    hrv = fetch_day(api.get_hrv_data, parse_hrv, day)
+    sleep_score = fetch_day(api.get_sleep_data, parse_sleep_score, day)
+    rhr = fetch_day(api.get_rhr_day, parse_rhr, day)
 
-    try:
-        sleep_score = api.get_sleep_data(today).get("dailySleepDTO", {}).get("sleepScores", {}).get("overall", {}).get("value")
-    except Exception:
-        sleep_score = None
-
-    try:
-        rhr = api.get_rhr_day(today).get("allMetrics", {}).get("metricsMap", {}).get("WELLNESS_RESTING_HEART_RATE", [{}])[0].get("value")
-    except Exception:
-        rhr = None
-
-    try:
-        week_activities = api.get_activities_by_date(last_monday, today)
-        week_runs = keep_only_runs(week_activities)
-        total_week_km = round(sum(run.get("distance", 0) for run in week_runs) / 1000, 1)
-    except Exception:
-        total_week_km = 0
+    week_runs = snapshot.runs_between(get_last_monday(day), day)
+    total_week_km = round(sum(run.get("distance", 0) for run in week_runs) / 1000, 1)
 
     return {
         "date": today,
-        "day_of_the_week": get_weekday_name(get_today_date()),
+        "day_of_the_week": get_weekday_name(day),
         "training_status": training_status,
-        "last_night_HRV": int(round(hrv)),
-        "last_night_sleep_score": int(round(sleep_score)),
-        "last_night_RHR": int(round(rhr)),
+        "last_night_HRV": round_or_none(hrv),
+        "last_night_sleep_score": round_or_none(sleep_score),
+        "last_night_RHR": round_or_none(rhr),
         "total_week_km": total_week_km
     }
 
@@ -74,7 +63,8 @@ def extract_daily_stats(api: Garmin) -> Dict[str, Any]:
 # ---------------------------------------------------------------------
 # Today's Run
 # ---------------------------------------------------------------------
-def extract_today_run_stats(api: Garmin) -> Dict[str, Any]:
+@traced(category="garmin")
+def extract_today_run_stats(api: Garmin, snapshot: ActivitySnapshot | None = None, day: date | None = None) -> Dict[str, Any]:
     """
     Determine whether a run occurred today and extract its metrics.
     Includes:
@@ -87,13 +77,9 @@ def extract_today_run_stats(api: Garmin) -> Dict[str, Any]:
         Dictionary with run metrics. If no run occurred,
         values are set to defaults and run_today_boolean is False.
     """
-    today = get_today_date().isoformat()
-
-    try:
-        today_activities = api.get_activities_by_date(today)
-    except Exception:
-        today_activities = None
-    today_runs = keep_only_runs(today_activities)
+    day = day or get_today_date()
+    snapshot = snapshot or ActivitySnapshot.fetch(api, day, day)
+    today_runs = keep_only_runs(snapshot.on(day))
 
     if len(today_runs) == 0:
         return {
@@ -118,143 +104,125 @@ def extract_today_run_stats(api: Garmin) -> Dict[str, Any]:
 
 
 # ---------------------------------------------------------------------
-# Four Week Averages
+# Location
 # ---------------------------------------------------------------------
-def extract_last_four_weeks_stats(api: Garmin) -> Dict[str, Any]:
+def get_run_start_coordinates(api: Garmin, run: dict) -> tuple | None:
     """
-    Compute rolling four-week averages.
-    Includes:
-        - Average weekly kilometers
-        - Average sleep score
-        - Average HRV
-        - Average resting heart rate
-    The time window spans the four full weeks preceding the current week.
+    Return the (latitude, longitude) a run started at.
+    Read from the activity summary when present; otherwise fall back to
+    the activity details (served from the response cache when wrapped).
     """
-    start_date = get_monday_four_weeks_ago()
-    end_date = get_last_monday() - timedelta(days=1)
+    lat, lon = run.get("startLatitude"), run.get("startLongitude")
+    if lat is not None and lon is not None:
+        return lat, lon
 
     try:
-        activities = api.get_activities_by_date(startdate=start_date.isoformat(), enddate=end_date.isoformat())
-        runs = keep_only_runs(activities)
-        avg_km = round(sum(run.get("distance", 0) / 1000 for run in runs) / 4, 1)
-    except Exception:
-        avg_km = 0
-
-    return {
-        "last_four_weeks_average_km": avg_km,
-        "last_four_weeks_average_sleep_score": round(sum(api.get_sleep_data((start_date+timedelta(days=i)).isoformat()).get("dailySleepDTO", {}).get("sleepScores", {}).get("overall", {}).get("value") for i in range(28)) / 28),
-        "last_four_weeks_average_HRV": round(sum(api.get_hrv_data((start_date+timedelta(days=i)).isoformat()).get("hrvSummary", {}).get("lastNightAvg", {}) for i in range(28)) / 28),
-        "last_four_weeks_average_RHR": round(sum(api.get_rhr_day((start_date+timedelta(days=i)).isoformat()).get("allMetrics", {}).get("metricsMap", {}).get("WELLNESS_RESTING_HEART_RATE", [{}])[0].get("value") for i in range(28)) / 28)
-    }
+        geo = api.get_activity_details(run["activityId"]).get("geoPolylineDTO")
+        if geo:
+            return geo["startPoint"].get("lat"), geo["startPoint"].get("lon")
+    except (*GARMIN_REQUEST_ERRORS, KeyError, AttributeError):
+        pass
+    return None
 
 
-# ---------------------------------------------------------------------
-# Recency Metrics
-# ---------------------------------------------------------------------
-def extract_since_last_activity_stats(api: Garmin) -> Dict[str, Any]:
+@traced(category="garmin")
+def extract_location_stats(api: Garmin, snapshot: ActivitySnapshot | None = None, day: date | None = None) -> Dict[str, Any]:
     """
-    Compute recency metrics for key activity types.
+    Infer location and travel behavior from recent run coordinates.
     Includes:
-        - Days since last run
-        - Days since last strength session
-        - Days since last quality session
-        - Aerobic/anaerobic effect of most recent run
-    Returns:
-        Dictionary with recency and intensity indicators.
+        - Most recent detected country
+        - Boolean indicating travel within last two weeks
+    Uses start coordinates of runs (from the activity summaries)
+    for country detection.
     """
-    last_monday_four_weeks_ago = get_monday_four_weeks_ago()
-    yesterday = get_today_date() - timedelta(days=1)
-
-    try:
-        activities = api.get_activities_by_date(last_monday_four_weeks_ago.isoformat(), yesterday.isoformat(), sortorder="desc")
-    except Exception:
-        activities = []
-
-    runs = keep_only_runs(activities)
-
-    if runs:
-        last_run = runs[0]
-        last_run_date = datetime.strptime(last_run.get("startTimeLocal", "").split(' ')[0], "%Y-%m-%d").date()
-        days_since_last_run = (get_today_date() - last_run_date).days
-        last_run_aerobic = round(last_run.get("aerobicTrainingEffect", 0), 1)
-        last_run_anaerobic = round(last_run.get("anaerobicTrainingEffect", 0), 1)
-    else:
-        days_since_last_run = None
-        last_run_aerobic = None
-        last_run_anaerobic = None
+    day = day or get_today_date()
+    snapshot = snapshot or ActivitySnapshot.fetch(api, get_monday_four_weeks_ago(day), day)
+    two_weeks_before = get_last_monday(day) - timedelta(days=14)
 
-    gym_sessions = [activity for activity in activities if activity.get("activityName", "") == "Strength"]
-    if gym_sessions:
-        last_gym = gym_sessions[0]
-        last_gym_date = datetime.strptime(last_gym.get("startTimeLocal", "").split(' ')[0], "%Y-%m-%d").date()
-        days_since_last_gym = (get_today_date() - last_gym_date).days
-    else:
-        days_since_last_gym = None
-
-    quality_session = [activity for activity in activities if activity not in gym_sessions and activity.get("aerobicTrainingEffect", 0) >= 3 or activity.get("anaerobicTrainingEffect", 0) >= 3]
-    if quality_session:
-        last_quality_session = quality_session[0]
-        last_quality_session_date = datetime.strptime(last_quality_session.get("startTimeLocal", "").split(' ')[0], "%Y-%m-%d").date()
-        days_since_last_quality_session = (get_today_date() - last_quality_session_date).days
-    else:
-        days_since_last_quality_session = None
+    runs = snapshot.runs_between(two_weeks_before, day, descending=True)
+    locations = [coords for coords in (get_run_start_coordinates(api, run) for run in runs) if coords]
 
+    countries = coordinates_to_country(locations)
 
     return {
-        "days_since_last_run": days_since_last_run,
-        "days_since_last_gym": days_since_last_gym,
-        "days_since_last_quality_session": days_since_last_quality_session,
-        "last_run_aerobic_effect": last_run_aerobic,
-        "last_run_anaerobic_effect": last_run_anaerobic
+        "location": countries[0],
+        "location_coordinates": locations[0],
+        "trip_in_the_last_two_weeks": find_trip(countries)
     }
 
 
 # ---------------------------------------------------------------------
-# Location
+# Rolling Features
 # ---------------------------------------------------------------------
-def extract_location_stats(api: Garmin) -> Dict[str, Any]:
+@traced(category="garmin")
+def extract_rolling_stats(api: Garmin, snapshot: ActivitySnapshot, daily_stats: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Infer location and travel behavior from recent run coordinates.
-    Includes:
-        - Most recent detected country
-        - Boolean indicating travel within last two weeks
-    Uses start coordinates of runs for country detection.
+    Compute weekly km, four-week averages and recency metrics
+    from the persisted rolling window.
+    The window is advanced by today's record, and the last
+    ROLLING_REFRESH_DAYS days are re-applied from the snapshot (keeping
+    their stored wellness values). When the window does not reach back
+    far enough, it is rebuilt from the stored dataset, or else from the
+    snapshot and wellness history.
     """
     today = get_today_date()
-    two_weeks_before = get_last_monday() - timedelta(days=14)
-
-    try:
-        activities = api.get_activities_by_date(two_weeks_before.isoformat(), today.isoformat(), sortorder="desc")
-    except Exception:
-        activities = []
-
-    runs = keep_only_runs(activities)
-    locations = []
+    yesterday = today - timedelta(days=1)
+    start = get_monday_four_weeks_ago()
+
+    rolling = RollingWindow.load()
+    if not rolling.covers(start, yesterday):
+        rolling = RollingWindow.rebuild_from_dataset(start, yesterday)
+    if not rolling.covers(start, yesterday):
+        rolling = RollingWindow.rebuild_from_api(api, snapshot, start, yesterday)
+
+    # Activities synced after an earlier run are picked up from the snapshot
+    for days_ago in range(ROLLING_REFRESH_DAYS, 0, -1):
+        day = today - timedelta(days=days_ago)
+        stored = rolling.days.get(day.isoformat())
+        if stored is not None:
+            rolling.update(day, build_day_record(snapshot.on(day), stored))
+
+    wellness = {
+        "sleep_score": daily_stats.get("last_night_sleep_score"),
+        "hrv": daily_stats.get("last_night_HRV"),
+        "rhr": daily_stats.get("last_night_RHR"),
+    }
+    rolling.update(today, build_day_record(snapshot.on(today), wellness))
+    rolling.save()
 
-    for run in runs:
-        try:
-            details = api.get_activity_details(run["activityId"])
-            geo = details.get("geoPolylineDTO")
-            if geo:
-                lat = geo["startPoint"].get("lat")
-                lon = geo["startPoint"].get("lon")
-                locations.append((lat, lon))
-        except Exception:
-            continue
+    return rolling.features(today)
 
-    countries = coordinates_to_country(locations)
 
-    return {
-        "location": countries[0],
-        "location_coordinates": locations[0],
-        "trip_in_the_last_two_weeks": find_trip(countries)
-    }
+# ---------------------------------------------------------------------
+# Combined Extraction
+# ---------------------------------------------------------------------
+# Garmin stages of the pipeline graph; they expect "garmin_api" as an input
+GARMIN_STAGES = [
+    Stage("garmin_snapshot", lambda garmin_api: {"snapshot": ActivitySnapshot.fetch(garmin_api)},
+          inputs=["garmin_api"], outputs=["snapshot"]),
+    Stage("garmin_daily", lambda garmin_api, snapshot: {"daily_stats": extract_daily_stats(garmin_api, snapshot)},
+          inputs=["garmin_api", "snapshot"], outputs=["daily_stats"]),
+    Stage("garmin_today_run", lambda garmin_api, snapshot: {"today_run_stats": extract_today_run_stats(garmin_api, snapshot)},
+          inputs=["garmin_api", "snapshot"], outputs=["today_run_stats"]),
+    Stage("garmin_location", lambda garmin_api, snapshot: {"location_stats": extract_location_stats(garmin_api, snapshot)},
+          inputs=["garmin_api", "snapshot"], outputs=["location_stats"]),
+    Stage("garmin_rolling", lambda garmin_api, snapshot, daily_stats: {"rolling_stats": extract_rolling_stats(garmin_api, snapshot, daily_stats)},
+          inputs=["garmin_api", "snapshot", "daily_stats"], outputs=["rolling_stats"]),
+]
+
+
+def merge_garmin_stats(values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge the outputs of GARMIN_STAGES into one Garmin row.
+    """
+    return values["daily_stats"] | values["today_run_stats"] | values["rolling_stats"] | values["location_stats"]
 
 
 def combine_garmin_data(api: Garmin) -> Dict[str, Any]:
     """
     Aggregate all extraction modules into a single unified dictionary.
-    Serves as the primary interface for downstream persistence
-    (e.g., CSV storage or database insertion).
-    """ 
-    return extract_daily_stats(api) | extract_today_run_stats(api) | extract_last_four_weeks_stats(api) | extract_since_last_activity_stats(api) | extract_location_stats(api)
\ No newline at end of file
+    Runs the same GARMIN_STAGES as the full pipeline, so all extractors
+    share one activity snapshot and the activity list is fetched from
+    Garmin only once per run.
+    """
+    return merge_garmin_stats(run_stages(GARMIN_STAGES, {"garmin_api": api}))
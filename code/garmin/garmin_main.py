@@ -2,22 +2,26 @@
 Entry point for Garmin data extraction.
 """
 
-from .example import init_api
+from .ratelimit import get_rate_limiter
+from .session import get_garmin_api
 from .extract import combine_garmin_data
 
 
 def main():
-    # Initialize API with authentication (will only prompt for credentials if needed)
-    api = init_api()
-
-    if not api:
-        print("Lost Garmin api")
+    # Shared authenticated client (will only prompt for credentials if needed)
+    try:
+        api = get_garmin_api()
+    except RuntimeError as e:
+        print(e)
         return
 
     try:
         return combine_garmin_data(api)
     except Exception as e:
         print("Garmin -", e)
+    finally:
+        print("Garmin cache -", api.cache_summary())
+        print("Garmin rate limit -", get_rate_limiter().summary())
 
 
 if __name__ == "__main__":
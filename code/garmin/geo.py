@@ -1,12 +1,243 @@
 """
 Geospatial helper logic for country detection and trip inference.
+
+Country boundaries are loaded lazily on the first lookup, from a
+precompiled WKB/array cache of the shapefile. geopandas is only imported
+when that cache has to be (re)built from the shapefile.
+
+Repeated lookups go through a memo keyed on grid-quantized coordinates.
+Cells that lie entirely inside one country (or entirely in the sea) are
+resolved once and remembered in memory and on disk. Border cells always
+fall back to the exact polygon test.
 """
 
+import math
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
 from typing import List, Tuple
-from shapely.geometry import Point
-from .config import WORLD
+import numpy as np
+from code.tracing import traced
+from .config import SHAPEFILE_PATH, COUNTRY_CACHE_DIR, GEO_CELL_DEGREES, GEO_MEMO_SIZE, GEO_CACHE_PATH
+
+
+_COUNTRY_INDEX: tuple | None = None
+_COUNTRY_MEMO: "CountryMemo | None" = None
+
+# Memo value for cells crossed by a border, which need the exact test
+BORDER = object()
+
+
+# ---------------------------------------------------------------------
+# Boundary Data
+# ---------------------------------------------------------------------
+def build_country_cache(shapefile_path: str = SHAPEFILE_PATH, cache_dir: str = COUNTRY_CACHE_DIR) -> None:
+    """
+    Precompile the country shapefile into memory-mappable arrays:
+        - wkb.npy: all polygons as concatenated WKB bytes (uint8)
+        - offsets.npy: start offset of each polygon, plus the total length
+        - names.npy: ADMIN country names
+    Rows keep the shapefile order.
+    """
+    import geopandas as gpd
+    import shapely
+
+    world = gpd.read_file(shapefile_path)
+    blobs = shapely.to_wkb(np.asarray(world.geometry.array, dtype=object))
+    offsets = np.concatenate([[0], np.cumsum([len(blob) for blob in blobs])]).astype(np.int64)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    np.save(os.path.join(cache_dir, "wkb.npy"), np.frombuffer(b"".join(blobs), dtype=np.uint8))
+    np.save(os.path.join(cache_dir, "offsets.npy"), offsets)
+    np.save(os.path.join(cache_dir, "names.npy"), world["ADMIN"].to_numpy(dtype=str))
+
+
+@traced(category="geo")
+def load_country_boundaries(cache_dir: str = COUNTRY_CACHE_DIR) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Load country polygons and names from the precompiled cache,
+    building it from the shapefile first if it does not exist.
+    Returns:
+        (object array of polygons, object array of country names)
+    """
+    import shapely
+
+    if not os.path.exists(os.path.join(cache_dir, "names.npy")):
+        build_country_cache(cache_dir=cache_dir)
+
+    wkb = np.load(os.path.join(cache_dir, "wkb.npy"), mmap_mode="r")
+    offsets = np.load(os.path.join(cache_dir, "offsets.npy"))
+    names = np.load(os.path.join(cache_dir, "names.npy"))
+
+    blobs = np.array([wkb[start:end].tobytes() for start, end in zip(offsets[:-1], offsets[1:])], dtype=object)
+    return shapely.from_wkb(blobs), names.astype(object)
+
+
+def get_country_index() -> tuple | None:
+    """
+    Build (once) a spatial index over the country polygons.
+    Returns:
+        (STRtree, prepared polygons, country names) in shapefile row order,
+        or None if the boundaries could not be loaded.
+    """
+    global _COUNTRY_INDEX
+    if _COUNTRY_INDEX is None:
+        import shapely
+        from shapely.strtree import STRtree
+
+        try:
+            geometries, names = load_country_boundaries()
+        except Exception as e:
+            print("World shapefile could not be loaded:", e)
+            return None
+        shapely.prepare(geometries)
+        _COUNTRY_INDEX = (STRtree(geometries), geometries, names)
+    return _COUNTRY_INDEX
+
+
+# ---------------------------------------------------------------------
+# Lookups
+# ---------------------------------------------------------------------
+def coordinates_to_countries(coords) -> np.ndarray:
+    """
+    Vectorized country lookup.
+    Parameters:
+        coords: Array-like of shape (N, 2) with (latitude, longitude) rows.
+    Returns:
+        Object array of N country names, None where no country matches.
+    When polygons overlap, the first matching country in boundary file
+    order wins.
+    """
+    coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+    countries = np.full(len(coords), None, dtype=object)
+    index = get_country_index() if len(coords) else None
+    if index is None:
+        return countries
+    tree, geometries, names = index
+    import shapely
 
+    lat, lon = coords[:, 0], coords[:, 1]
+    valid = np.isfinite(lat) & np.isfinite(lon)
+    point_idx, geom_idx = tree.query(shapely.points(np.where(valid, lon, 0), np.where(valid, lat, 0)))
 
+    hit = valid[point_idx] & shapely.contains_xy(geometries[geom_idx], lon[point_idx], lat[point_idx])
+    point_idx, geom_idx = point_idx[hit], geom_idx[hit]
+
+    # Lowest polygon index per point, matching the previous iloc[0] tie-breaking
+    order = np.lexsort((geom_idx, point_idx))
+    point_idx, geom_idx = point_idx[order], geom_idx[order]
+    _, first = np.unique(point_idx, return_index=True)
+    countries[point_idx[first]] = names[geom_idx[first]]
+    return countries
+
+
+def classify_cell(i: int, j: int, cell: float):
+    """
+    Resolve a grid cell without looking at any specific point.
+    Returns:
+        The country name if the cell lies inside exactly one country,
+        None if it touches no country, or BORDER otherwise.
+    """
+    import shapely
+
+    index = get_country_index()
+    if index is None:
+        return BORDER
+    tree, geometries, names = index
+
+    box = shapely.box(j * cell, i * cell, (j + 1) * cell, (i + 1) * cell)
+    candidates = [k for k in tree.query(box) if geometries[k].intersects(box)]
+    if not candidates:
+        return None
+    if len(candidates) == 1 and geometries[candidates[0]].contains_properly(box):
+        return names[candidates[0]]
+    return BORDER
+
+
+class CountryMemo:
+    """
+    Quantized country lookup cache: in-process LRU in front of an SQLite store.
+    """
+
+    def __init__(self, path: str = GEO_CACHE_PATH, cell: float = GEO_CELL_DEGREES, size: int = GEO_MEMO_SIZE):
+        self.cell = cell
+        self.size = size
+        self._lru: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cells ("
+            "cell REAL NOT NULL, i INTEGER NOT NULL, j INTEGER NOT NULL, "
+            "country TEXT, border INTEGER NOT NULL, PRIMARY KEY (cell, i, j))"
+        )
+        self._conn.commit()
+
+    def quantize(self, lat: float, lon: float) -> Tuple[int, int]:
+        """
+        Return the (row, column) of the grid cell containing a point.
+        """
+        return math.floor(lat / self.cell), math.floor(lon / self.cell)
+
+    def _remember(self, key: Tuple[int, int], value) -> None:
+        self._lru[key] = value
+        if len(self._lru) > self.size:
+            self._lru.popitem(last=False)
+
+    def _get_cell(self, key: Tuple[int, int]):
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            return self._lru[key]
+
+        row = self._conn.execute(
+            "SELECT country, border FROM cells WHERE cell = ? AND i = ? AND j = ?", (self.cell, *key)
+        ).fetchone()
+        if row is not None:
+            value = BORDER if row[1] else row[0]
+        else:
+            value = classify_cell(*key, self.cell)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cells (cell, i, j, country, border) VALUES (?, ?, ?, ?, ?)",
+                (self.cell, *key, None if value is BORDER else value, int(value is BORDER)),
+            )
+            self._conn.commit()
+        self._remember(key, value)
+        return value
+
+    def lookup(self, coords) -> np.ndarray:
+        """
+        Memoized equivalent of coordinates_to_countries.
+        """
+        coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+        countries = np.full(len(coords), None, dtype=object)
+        exact = []
+
+        with self._lock:
+            for k, (lat, lon) in enumerate(coords):
+                if not (math.isfinite(lat) and math.isfinite(lon)):
+                    continue
+                value = self._get_cell(self.quantize(lat, lon))
+                if value is BORDER:
+                    exact.append(k)
+                else:
+                    countries[k] = value
+
+        if exact:
+            countries[exact] = coordinates_to_countries(coords[exact])
+        return countries
+
+
+def get_country_memo() -> CountryMemo:
+    """
+    Return the process-wide country memo.
+    """
+    global _COUNTRY_MEMO
+    if _COUNTRY_MEMO is None:
+        _COUNTRY_MEMO = CountryMemo()
+    return _COUNTRY_MEMO
+
+
+@traced(category="geo")
 def coordinates_to_country(coords: List[tuple]) -> List[str]:
     """
     Convert latitude/longitude coordinates to country names.
@@ -15,21 +246,10 @@ def coordinates_to_country(coords: List[tuple]) -> List[str]:
     Returns:
         List of detected country names. May be empty if no match.
     """
-    if WORLD is None or not coords:
+    if not coords:
         return []
 
-    country_list = []
-    for lat, lon in coords:
-        try:
-            point = Point(lon, lat)
-            match = WORLD[WORLD.geometry.apply(lambda geom: point.within(geom))]
-
-            if not match.empty:
-                country_list.append(match.iloc[0]["ADMIN"])
-        except Exception:
-            continue
-
-    return country_list
+    return [country for country in get_country_memo().lookup(coords) if country is not None]
 
 
 def find_trip(country_list: List[str]) -> bool:
@@ -37,4 +257,9 @@ def find_trip(country_list: List[str]) -> bool:
     Determine whether multiple unique countries appear in the list.
     Used to infer potential travel in the analysis window.
     """
-    return len(set(country_list)) > 1
\ No newline at end of file
+    return len(set(country_list)) > 1
+
+
+if __name__ == "__main__":
+    build_country_cache()
+    print("Country cache written to", os.path.abspath(COUNTRY_CACHE_DIR))
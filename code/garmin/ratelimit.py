@@ -0,0 +1,206 @@
+"""
+Process-wide rate limiting for Garmin Connect requests.
+
+The limiter is installed on the client's HTTP layer (garth's request),
+so every request takes a token from one shared bucket, including each
+page fetched inside a paginated client call, and concurrent fan-outs and
+backfills cannot exceed the configured request rate together. 429 and
+503 responses pause all callers (for Retry-After, or an exponential
+backoff) and halve the rate; successful requests slowly raise it back
+to the configured maximum.
+Time spent waiting is recorded and reported at the end of a run.
+"""
+
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable
+import requests
+from garth.exc import GarthException
+from garminconnect import Garmin, GarminConnectConnectionError, GarminConnectTooManyRequestsError
+from code.tracing import accumulate
+from .config import GARMIN_RATE_PER_SECOND, GARMIN_RATE_BURST, GARMIN_MIN_RATE, GARMIN_MAX_RETRIES, GARMIN_BACKOFF_SECONDS
+
+
+# Errors raised by a Garmin request that failed (as opposed to a bug or
+# an authentication problem, which should surface)
+GARMIN_REQUEST_ERRORS = (GarminConnectConnectionError, GarminConnectTooManyRequestsError, GarthException, requests.RequestException)
+
+_RATE_LIMITER: "RateLimiter | None" = None
+
+
+# ---------------------------------------------------------------------
+# Error Classification
+# ---------------------------------------------------------------------
+def iter_error_chain(error: BaseException | None):
+    """
+    Yield an error and the errors it wraps: garth's .error, then the
+    chained __cause__ / __context__ (garminconnect re-raises HTTP errors
+    as its own exceptions without a response).
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        wrapped = getattr(error, "error", None)
+        error = wrapped if isinstance(wrapped, BaseException) else error.__cause__ or error.__context__
+
+
+def get_error_response(error: Exception) -> Any:
+    """
+    Return the HTTP response carried anywhere in an error's chain, if any.
+    """
+    for source in iter_error_chain(error):
+        response = getattr(source, "response", None)
+        if getattr(response, "status_code", None) is not None:
+            return response
+    return None
+
+
+def get_status_code(error: Exception) -> int | None:
+    """
+    Return the HTTP status code carried by a Garmin/garth error, if any.
+    """
+    return getattr(get_error_response(error), "status_code", None)
+
+
+def get_retry_after(error: Exception) -> float | None:
+    """
+    Return the Retry-After delay in seconds carried by an error response, if any.
+    """
+    headers = getattr(get_error_response(error), "headers", None) or {}
+    try:
+        return float(headers["Retry-After"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """
+    Determine whether an error is a 429 Too Many Requests response.
+    """
+    if any(isinstance(source, GarminConnectTooManyRequestsError) for source in iter_error_chain(error)):
+        return True
+    return get_status_code(error) == 429
+
+
+def is_overloaded(error: Exception) -> bool:
+    """
+    Determine whether an error asks us to slow down (429 or 503).
+    """
+    return is_rate_limited(error) or get_status_code(error) == 503
+
+
+# ---------------------------------------------------------------------
+# Token Bucket
+# ---------------------------------------------------------------------
+class RateLimiter:
+    """
+    Thread-safe token bucket with adaptive (AIMD) rate and shared backoff.
+    """
+
+    def __init__(self, rate: float = GARMIN_RATE_PER_SECOND, burst: int = GARMIN_RATE_BURST, min_rate: float = GARMIN_MIN_RATE):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min(min_rate, rate)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+        self.backoffs = 0
+
+    def acquire(self) -> float:
+        """
+        Block until a request may be sent.
+        Returns the time waited in seconds.
+        """
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                delay = self._resume_at - now
+                if delay <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        self.requests += 1
+                        waited = now - started
+                        if waited > 0.001:
+                            self.throttled += 1
+                            self.throttled_seconds += waited
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+    def penalize(self, retry_after: float | None, attempt: int) -> None:
+        """
+        Pause every caller and halve the rate after a 429/503.
+        """
+        with self._lock:
+            delay = retry_after or GARMIN_BACKOFF_SECONDS * (2 ** attempt)
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0.0
+            self.backoffs += 1
+
+    def reward(self) -> None:
+        """
+        Raise the rate again by a small step after a successful request.
+        """
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def call(self, func: Callable, *args, max_retries: int = GARMIN_MAX_RETRIES, **kwargs) -> Any:
+        """
+        Call func under the limiter, retrying 429/503 responses.
+        Other errors, and the last overload error, are re-raised.
+        """
+        for attempt in range(max_retries + 1):
+            accumulate("wait_ms", self.acquire() * 1000)
+            try:
+                result = func(*args, **kwargs)
+            except GARMIN_REQUEST_ERRORS as e:
+                if not is_overloaded(e) or attempt == max_retries:
+                    raise
+                self.penalize(get_retry_after(e), attempt)
+                accumulate("retries", 1)
+                continue
+            self.reward()
+            return result
+
+    def summary(self) -> str:
+        """
+        Return a one-line summary of limiter activity.
+        """
+        with self._lock:
+            return f"{self.requests} requests, {self.throttled} delayed ({self.throttled_seconds:.1f} s waiting across callers), {self.backoffs} backoffs"
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Return the process-wide Garmin rate limiter.
+    """
+    global _RATE_LIMITER
+    if _RATE_LIMITER is None:
+        _RATE_LIMITER = RateLimiter()
+    return _RATE_LIMITER
+
+
+def install_rate_limiter(api: Garmin, limiter: RateLimiter | None = None) -> None:
+    """
+    Send every HTTP request of a Garmin client through the rate limiter
+    by wrapping its garth client's request method. Client methods that
+    make several requests (pagination) take one token per request.
+    """
+    limiter = limiter or get_rate_limiter()
+    request = api.garth.request
+
+    @wraps(request)
+    def limited_request(*args, **kwargs):
+        return limiter.call(request, *args, **kwargs)
+    api.garth.request = limited_request
@@ -0,0 +1,294 @@
+"""
+Incremental rolling-window engine for weekly and four-week features.
+
+Instead of recomputing rolling features from raw API data every run,
+the engine keeps persisted state:
+    - per-week sums and counts (km, sleep score, HRV, RHR)
+    - the last two days each activity kind (run, gym, quality) was seen
+    - the per-day records of the last five weeks, for corrections
+Applying one day of data costs O(1), and features can be read for any
+day once the state has been advanced to it.
+"""
+
+import json
+import os
+from datetime import date, timedelta
+from typing import Any, Dict, List
+import pandas as pd
+from garminconnect import Garmin
+from .config import ROLLING_STATE_PATH
+from .snapshot import ActivitySnapshot
+from .utils import keep_only_runs
+from .wellness import WELLNESS_METRICS, fetch_wellness_range
+
+
+# Per-day records older than this are dropped; covers the longest lookback (4 weeks + 6 days)
+RETENTION_DAYS = 35
+ACTIVITY_KINDS = ("run", "gym", "quality")
+
+# Dataset columns a rolling window can be rebuilt from
+DATASET_COLUMNS = [
+    "date", "run_today_boolean", "run_today_distance_km", "run_today_aerobic_effect", "run_today_anaerobic_effect",
+    "last_night_sleep_score", "last_night_HRV", "last_night_RHR",
+    "days_since_last_run", "days_since_last_gym", "days_since_last_quality_session",
+    "last_run_aerobic_effect", "last_run_anaerobic_effect",
+]
+
+
+# ---------------------------------------------------------------------
+# Day Records
+# ---------------------------------------------------------------------
+def is_quality_session(activity: dict) -> bool:
+    """
+    A non-strength session with aerobic effect >= 3,
+    or any session with anaerobic effect >= 3.
+    """
+    is_gym = activity.get("activityName", "") == "Strength"
+    return (not is_gym and activity.get("aerobicTrainingEffect", 0) >= 3) or activity.get("anaerobicTrainingEffect", 0) >= 3
+
+
+def build_day_record(activities: List[dict], wellness: Dict[str, float | None]) -> Dict[str, Any]:
+    """
+    Reduce one day's activities and wellness values to a rolling-window record.
+    """
+    runs = keep_only_runs(activities)
+    last_run = max(runs, key=lambda run: run.get("startTimeLocal", "")) if runs else {}
+    return {
+        "km": sum(run.get("distance", 0) for run in runs) / 1000,
+        "sleep_score": wellness.get("sleep_score"),
+        "hrv": wellness.get("hrv"),
+        "rhr": wellness.get("rhr"),
+        "run": bool(runs),
+        "run_aerobic": last_run.get("aerobicTrainingEffect", 0),
+        "run_anaerobic": last_run.get("anaerobicTrainingEffect", 0),
+        "gym": any(activity.get("activityName", "") == "Strength" for activity in activities),
+        "quality": any(is_quality_session(activity) for activity in activities),
+    }
+
+
+def get_week_start(day: date) -> date:
+    """
+    Return the Monday of the week containing day.
+    """
+    return day - timedelta(days=day.weekday())
+
+
+def _empty_week() -> Dict[str, Any]:
+    return {"km": 0.0, **{metric: [0.0, 0] for metric in WELLNESS_METRICS}}
+
+
+# ---------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------
+class RollingWindow:
+    """
+    Persisted rolling sums, counts and last-seen dates.
+    """
+
+    def __init__(self, state: Dict[str, Any] | None = None):
+        state = state or {}
+        self.first_day: date | None = date.fromisoformat(state["first_day"]) if state.get("first_day") else None
+        self.last_day: date | None = date.fromisoformat(state["last_day"]) if state.get("last_day") else None
+        self.days: Dict[str, Dict[str, Any]] = state.get("days", {})
+        self.weeks: Dict[str, Dict[str, Any]] = state.get("weeks", {})
+        self.last_seen: Dict[str, List[str | None]] = state.get("last_seen", {kind: [None, None] for kind in ACTIVITY_KINDS})
+
+    # -----------------------------------------------------------------
+    # Persistence
+    # -----------------------------------------------------------------
+    @classmethod
+    def load(cls, path: str = ROLLING_STATE_PATH) -> "RollingWindow":
+        """
+        Load persisted state, or return an empty window if none exists.
+        """
+        if not os.path.exists(path):
+            return cls()
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def save(self, path: str = ROLLING_STATE_PATH) -> None:
+        """
+        Atomically persist the current state.
+        """
+        state = {
+            "first_day": self.first_day.isoformat() if self.first_day else None,
+            "last_day": self.last_day.isoformat() if self.last_day else None,
+            "days": self.days,
+            "weeks": self.weeks,
+            "last_seen": self.last_seen,
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    # -----------------------------------------------------------------
+    # Updates
+    # -----------------------------------------------------------------
+    def covers(self, start: date, end: date) -> bool:
+        """
+        Whether every day in [start, end] has been applied without gaps.
+        """
+        return self.first_day is not None and self.first_day <= start and self.last_day >= end
+
+    def update(self, day: date, record: Dict[str, Any]) -> None:
+        """
+        Apply one day's record. Re-applying a retained day replaces it.
+        """
+        key = day.isoformat()
+        appended = self.last_day is None or day > self.last_day
+
+        if not appended and key not in self.days:
+            raise ValueError(f"{key} is outside the retained window; rebuild the rolling state instead.")
+        if self.last_day is None or day > self.last_day + timedelta(days=1):
+            # Gap (or first day): earlier weeks are incomplete from here on
+            self.first_day = day
+
+        previous = self.days.get(key)
+        if previous is not None:
+            self._apply(day, previous, -1)
+        self._apply(day, record, 1)
+        self.days[key] = record
+
+        if appended:
+            self.last_day = day
+            for kind in ACTIVITY_KINDS:
+                if record[kind]:
+                    self.last_seen[kind] = [key, self.last_seen[kind][0]]
+        else:
+            self._recompute_last_seen()
+        self._prune()
+
+    def _apply(self, day: date, record: Dict[str, Any], sign: int) -> None:
+        week = self.weeks.setdefault(get_week_start(day).isoformat(), _empty_week())
+        week["km"] += sign * record["km"]
+        for metric in WELLNESS_METRICS:
+            if record[metric] is not None:
+                week[metric][0] += sign * record[metric]
+                week[metric][1] += sign
+
+    def _recompute_last_seen(self) -> None:
+        for kind in ACTIVITY_KINDS:
+            seen = sorted((key for key, record in self.days.items() if record[kind]), reverse=True)
+            self.last_seen[kind] = (seen + [None, None])[:2]
+
+    def _prune(self) -> None:
+        oldest_day = (self.last_day - timedelta(days=RETENTION_DAYS)).isoformat()
+        oldest_week = (get_week_start(self.last_day) - timedelta(weeks=5)).isoformat()
+        for key in [key for key in self.days if key < oldest_day]:
+            del self.days[key]
+        for key in [key for key in self.weeks if key < oldest_week]:
+            del self.weeks[key]
+
+    # -----------------------------------------------------------------
+    # Features
+    # -----------------------------------------------------------------
+    def _last_seen_before(self, kind: str, day: date) -> date | None:
+        for key in self.last_seen[kind]:
+            if key is not None and key < day.isoformat():
+                return date.fromisoformat(key)
+        return None
+
+    def features(self, day: date) -> Dict[str, Any]:
+        """
+        Return weekly km, four-week averages and recency counters for day.
+        Matches the definitions used by the extraction functions:
+        the current week includes day itself, recency looks back to the
+        Monday four weeks ago and excludes day itself.
+        """
+        monday = get_week_start(day)
+        current_week = self.weeks.get(monday.isoformat(), _empty_week())
+        prior_weeks = [self.weeks.get((monday - timedelta(weeks=i)).isoformat(), _empty_week()) for i in range(1, 5)]
+
+        def average(metric):
+            total = sum(week[metric][0] for week in prior_weeks)
+            count = sum(week[metric][1] for week in prior_weeks)
+            return round(total / count) if count else None
+
+        recency_start = monday - timedelta(weeks=4)
+        days_since = {}
+        for kind in ACTIVITY_KINDS:
+            seen = self._last_seen_before(kind, day)
+            days_since[kind] = (day - seen).days if seen and seen >= recency_start else None
+
+        last_run = self.days.get(self._last_seen_before("run", day).isoformat(), {}) if days_since["run"] is not None else None
+
+        return {
+            "total_week_km": round(current_week["km"], 1),
+            "last_four_weeks_average_km": round(sum(week["km"] for week in prior_weeks) / 4, 1),
+            "last_four_weeks_average_sleep_score": average("sleep_score"),
+            "last_four_weeks_average_HRV": average("hrv"),
+            "last_four_weeks_average_RHR": average("rhr"),
+            "days_since_last_run": days_since["run"],
+            "days_since_last_gym": days_since["gym"],
+            "days_since_last_quality_session": days_since["quality"],
+            "last_run_aerobic_effect": round(last_run.get("run_aerobic", 0), 1) if last_run is not None else None,
+            "last_run_anaerobic_effect": round(last_run.get("run_anaerobic", 0), 1) if last_run is not None else None,
+        }
+
+    # -----------------------------------------------------------------
+    # Rebuilding
+    # -----------------------------------------------------------------
+    @classmethod
+    def rebuild_from_api(cls, api: Garmin, snapshot: ActivitySnapshot, start: date, end: date) -> "RollingWindow":
+        """
+        Rebuild state for [start, end] from the activity snapshot and
+        per-day wellness data (served from the response cache when wrapped).
+        """
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        wellness = fetch_wellness_range(api, days)
+        window = cls()
+        for day in days:
+            window.update(day, build_day_record(snapshot.on(day), {metric: wellness[metric][day] for metric in WELLNESS_METRICS}))
+        return window
+
+    @classmethod
+    def rebuild_from_dataset(cls, start: date, end: date) -> "RollingWindow":
+        """
+        Rebuild state for [start, end] from the stored dataset (any storage
+        backend), without API calls. Days missing from the dataset leave a
+        gap, so the result may not cover the whole range.
+        Gym, quality and last-run effects are recovered from each row's
+        recency columns, which point back to the day they happened on.
+        """
+        from code.pipeline.storage import load_dataset
+
+        try:
+            df = load_dataset(DATASET_COLUMNS, start.isoformat(), end.isoformat())
+        except (OSError, ValueError, KeyError):
+            return cls()
+
+        def number(value):
+            return None if pd.isna(value) else float(value)
+
+        rows = sorted(df.to_dict("records"), key=lambda row: row["date"])
+        records: Dict[date, Dict[str, Any]] = {}
+        for row in rows:
+            records[row["date"].date()] = {
+                "km": number(row["run_today_distance_km"]) or 0.0,
+                "sleep_score": number(row["last_night_sleep_score"]),
+                "hrv": number(row["last_night_HRV"]),
+                "rhr": number(row["last_night_RHR"]),
+                "run": not pd.isna(row["run_today_boolean"]) and bool(row["run_today_boolean"]),
+                "run_aerobic": number(row["run_today_aerobic_effect"]) or 0.0,
+                "run_anaerobic": number(row["run_today_anaerobic_effect"]) or 0.0,
+                "gym": False,
+                "quality": False,
+            }
+
+        for row in rows:
+            day = row["date"].date()
+            for kind, column in (("run", "days_since_last_run"), ("gym", "days_since_last_gym"), ("quality", "days_since_last_quality_session")):
+                days_since = number(row[column])
+                seen = records.get(day - timedelta(days=int(days_since))) if days_since else None
+                if seen is None:
+                    continue
+                seen[kind] = True
+                if kind == "run":
+                    seen["run_aerobic"] = number(row["last_run_aerobic_effect"]) or 0.0
+                    seen["run_anaerobic"] = number(row["last_run_anaerobic_effect"]) or 0.0
+
+        window = cls()
+        for day in sorted(records):
+            window.update(day, records[day])
+        return window
@@ -0,0 +1,109 @@
+"""
+Process-wide Garmin session.
+
+Every module asks get_garmin_api() for its client instead of calling
+init_api() itself, so a process logs in (and loads the token store) once.
+The shared client:
+- is wrapped as CachedGarmin(api), with every HTTP request sent
+  through the shared rate limiter (see ratelimit.py)
+- keeps a keep-alive connection pool sized for concurrent fetches,
+  so TLS handshakes are paid once per connection, not per request
+- refreshes its OAuth2 token in the background shortly before it
+  expires, and saves the new tokens to the token store
+
+With RUN_DATA_REPLAY set (see code/replay), the real client is recorded,
+or replaced by a local stand-in that needs no login.
+"""
+
+import os
+import threading
+import time
+from requests.adapters import HTTPAdapter
+from garminconnect import Garmin
+from .cache import CachedGarmin
+from code.replay import get_replay_mode, get_fixture_store, get_replay_conditions, get_state_path
+from code.tracing import is_tracing, record_response
+from .config import GARMIN_CACHE_PATH, GARMIN_TOKENSTORE, GARMIN_POOL_SIZE, GARMIN_TOKEN_REFRESH_MARGIN
+from .example import init_api
+from .ratelimit import GARMIN_REQUEST_ERRORS, install_rate_limiter
+
+
+_SESSION_LOCK = threading.Lock()
+_GARMIN_API: CachedGarmin | None = None
+
+
+def configure_connection_pool(api: Garmin, pool_size: int = GARMIN_POOL_SIZE) -> None:
+    """
+    Mount a keep-alive pool large enough for every concurrent worker
+    on the client's HTTP session (requests keeps 10 connections by default).
+    """
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    api.garth.sess.mount("https://", adapter)
+
+
+def get_token_expiry(api: Garmin) -> float | None:
+    """
+    Return the POSIX time the OAuth2 access token expires at, if known.
+    """
+    return getattr(getattr(api.garth, "oauth2_token", None), "expires_at", None)
+
+
+def schedule_token_refresh(api: Garmin, margin: float = GARMIN_TOKEN_REFRESH_MARGIN) -> None:
+    """
+    Refresh the OAuth2 token `margin` seconds before it expires, then
+    reschedule for the new token. Runs on a daemon timer thread.
+    """
+    expires_at = get_token_expiry(api)
+    if expires_at is None:
+        return
+
+    def refresh():
+        try:
+            api.garth.refresh_oauth2()
+            api.garth.dump(os.path.expanduser(GARMIN_TOKENSTORE))
+        except GARMIN_REQUEST_ERRORS as e:
+            # Requests keep working: garth refreshes an expired token on demand
+            print("Garmin token refresh failed -", e)
+            return
+        schedule_token_refresh(api, margin)
+
+    remaining = expires_at - time.time()
+    # Tokens living shorter than the margin are refreshed halfway through their life
+    delay = remaining - margin if remaining > margin else max(1.0, remaining / 2)
+    timer = threading.Timer(delay, refresh)
+    timer.daemon = True
+    timer.start()
+
+
+def build_garmin_api():
+    """
+    Log in and return a configured Garmin client (or its replay stand-in).
+    """
+    mode = get_replay_mode()
+    if mode == "replay":
+        from code.replay.garmin import ReplayGarmin
+        return ReplayGarmin(get_fixture_store("garmin"), get_replay_conditions())
+
+    api = init_api()
+    if not api:
+        raise RuntimeError("Lost Garmin api")
+    configure_connection_pool(api)
+    install_rate_limiter(api)
+    schedule_token_refresh(api)
+    if is_tracing():
+        api.garth.sess.hooks["response"].append(record_response)
+    if mode == "record":
+        from code.replay.garmin import RecordingGarmin
+        return RecordingGarmin(api, get_fixture_store("garmin"))
+    return api
+
+
+def get_garmin_api() -> CachedGarmin:
+    """
+    Return the shared, authenticated Garmin client, logging in on first use.
+    """
+    global _GARMIN_API
+    with _SESSION_LOCK:
+        if _GARMIN_API is None:
+            _GARMIN_API = CachedGarmin(build_garmin_api(), get_state_path(GARMIN_CACHE_PATH))
+        return _GARMIN_API
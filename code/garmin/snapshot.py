@@ -0,0 +1,83 @@
+"""
+Shared in-memory snapshot of Garmin activities.
+
+A single activity list request covers the union of every extraction
+window (Monday four weeks ago through today). Extractors then slice
+the snapshot by date instead of querying Garmin again.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+from garminconnect import Garmin
+from code.tracing import traced
+from .ratelimit import GARMIN_REQUEST_ERRORS
+from .utils import get_today_date, get_monday_four_weeks_ago, keep_only_runs
+
+
+def get_activity_date(activity: dict) -> date | None:
+    """
+    Return the local calendar date an activity started on.
+    """
+    start_time = activity.get("startTimeLocal")
+    if not start_time:
+        return None
+    return datetime.strptime(start_time.split(' ')[0], "%Y-%m-%d").date()
+
+
+class ActivitySnapshot:
+    """
+    Activities fetched once and indexed by local date.
+    Lists are kept in ascending start time order.
+    """
+
+    def __init__(self, activities: List[dict], start: date, end: date):
+        self.start = start
+        self.end = end
+        self._by_date: Dict[date, List[dict]] = defaultdict(list)
+        self._runs_by_date: Dict[date, List[dict]] = defaultdict(list)
+
+        for activity in sorted(activities, key=lambda a: a.get("startTimeLocal", "")):
+            activity_date = get_activity_date(activity)
+            if activity_date is None:
+                continue
+            self._by_date[activity_date].append(activity)
+        for activity_date, day_activities in self._by_date.items():
+            self._runs_by_date[activity_date] = keep_only_runs(day_activities)
+
+    @classmethod
+    @traced("ActivitySnapshot.fetch", category="garmin")
+    def fetch(cls, api: Garmin, start: date | None = None, end: date | None = None) -> "ActivitySnapshot":
+        """
+        Fetch all activities in [start, end] with a single API call.
+        Defaults to the union window used by the extraction modules.
+        """
+        start = start or get_monday_four_weeks_ago()
+        end = end or get_today_date()
+
+        try:
+            activities = api.get_activities_by_date(start.isoformat(), end.isoformat())
+        except GARMIN_REQUEST_ERRORS:
+            activities = []
+
+        return cls(activities or [], start, end)
+
+    def _slice(self, index: Dict[date, List[dict]], start: date, end: date, descending: bool) -> List[dict]:
+        result = []
+        for offset in range((end - start).days + 1):
+            result.extend(index.get(start + timedelta(days=offset), []))
+        if descending:
+            result.reverse()
+        return result
+
+    def runs_between(self, start: date, end: date, descending: bool = False) -> List[dict]:
+        """
+        Return running activities started within [start, end].
+        """
+        return self._slice(self._runs_by_date, start, end, descending)
+
+    def on(self, day: date) -> List[dict]:
+        """
+        Return all activities started on a given day.
+        """
+        return list(self._by_date.get(day, []))
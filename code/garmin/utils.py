@@ -2,34 +2,39 @@
 General utility helpers used across extraction modules.
 """
 
-from datetime import date, timedelta
+import os
+from datetime import date, datetime, timedelta, tzinfo
 from typing import List
 from dateutil.relativedelta import relativedelta, MO
 from .config import DAYS_OF_THE_WEEK
 
 
-def get_today_date() -> date:
+def get_today_date(tz: tzinfo | None = None) -> date:
     """
-    Return the current calendar date.
+    Return the current calendar date (local, or in tz when given).
     Used as the single source of truth for all date-based calculations.
+    RUN_DATA_TODAY (ISO date) pins it, e.g. to the day fixtures were recorded.
     """
-    return date.today()
+    today = os.getenv("RUN_DATA_TODAY")
+    if today:
+        return date.fromisoformat(today)
+    return datetime.now(tz).date() if tz else date.today()
 
 
-def get_last_monday() -> date:
+def get_last_monday(day: date | None = None) -> date:
     """
-    Return the date of the most recent Monday.
+    Return the date of the most recent Monday on or before day (default: today).
     Used to define weekly aggregation windows.
     """
-    return get_today_date() - relativedelta(weekday=MO(-1))
+    return (day or get_today_date()) - relativedelta(weekday=MO(-1))
 
 
-def get_monday_four_weeks_ago() -> date:
+def get_monday_four_weeks_ago(day: date | None = None) -> date:
     """
     Return the Monday four weeks prior to the most recent Monday.
     Defines the rolling 4-week analysis window.
     """
-    return get_last_monday() - timedelta(days=28)
+    return get_last_monday(day) - timedelta(days=28)
 
 
 def get_weekday_name(date_curr) -> str:
@@ -67,4 +72,11 @@ def calculate_weighted_training_effect(run_activities: List[dict], effect: str)
     total_training_load = get_total_run_statistic(run_activities, "activityTrainingLoad")
     if total_training_load == 0:
         return 0.0
-    return sum([run.get(effect, 0)*run.get("activityTrainingLoad", 0) for run in run_activities]) / total_training_load
\ No newline at end of file
+    return sum([run.get(effect, 0)*run.get("activityTrainingLoad", 0) for run in run_activities]) / total_training_load
+
+
+def round_or_none(value) -> int | None:
+    """
+    Round a metric to an int, keeping missing values as None.
+    """
+    return int(round(value)) if value is not None else None
@@ -0,0 +1,217 @@
+"""
+Concurrent fetching of Garmin wellness metrics.
+
+Multi-day windows prefer the range endpoints behind Garmin Connect
+(sleep score, HRV and resting heart rate), requested in chunks of up to
+WELLNESS_RANGE_DAYS days, so request count scales with weeks rather than
+days. Metrics without a range endpoint (training status), and chunks
+the service rejects, are fetched per day over a bounded thread pool.
+
+Throttling and 429/503 retries happen in the shared rate limiter
+installed on the client's HTTP layer (see ratelimit.py); a day that
+still fails becomes a missing value instead of an error.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List
+from garminconnect import Garmin
+from code.tracing import traced
+from .config import WELLNESS_MAX_WORKERS, WELLNESS_RANGE_DAYS
+from .ratelimit import GARMIN_REQUEST_ERRORS
+
+
+# ---------------------------------------------------------------------
+# Response Parsing
+# ---------------------------------------------------------------------
+def parse_sleep_score(data: Dict[str, Any] | None) -> float | None:
+    """
+    Extract the overall sleep score from a get_sleep_data response.
+    """
+    return (data or {}).get("dailySleepDTO", {}).get("sleepScores", {}).get("overall", {}).get("value")
+
+
+def parse_hrv(data: Dict[str, Any] | None) -> float | None:
+    """
+    Extract last night's average HRV from a get_hrv_data response.
+    """
+    return ((data or {}).get("hrvSummary") or {}).get("lastNightAvg")
+
+
+def parse_rhr(data: Dict[str, Any] | None) -> float | None:
+    """
+    Extract the resting heart rate from a get_rhr_day response.
+    """
+    values = (data or {}).get("allMetrics", {}).get("metricsMap", {}).get("WELLNESS_RESTING_HEART_RATE") or [{}]
+    return values[0].get("value")
+
+
+def parse_training_status(data: Dict[str, Any] | None) -> str | None:
+    """
+    Extract the training status phrase from a get_training_status response.
+    """
+    latest = ((data or {}).get("mostRecentTrainingStatus") or {}).get("latestTrainingStatusData") or {}
+    return latest.get("3601168031", {}).get("trainingStatusFeedbackPhrase")
+
+
+# Metric name -> (Garmin client method, response parser)
+WELLNESS_METRICS: Dict[str, tuple] = {
+    "sleep_score": ("get_sleep_data", parse_sleep_score),
+    "hrv": ("get_hrv_data", parse_hrv),
+    "rhr": ("get_rhr_day", parse_rhr),
+}
+
+# Non-numeric per-day endpoints that can share the same fan-out
+DAILY_ENDPOINTS: Dict[str, tuple] = WELLNESS_METRICS | {
+    "training_status": ("get_training_status", parse_training_status),
+}
+
+
+# Errors that turn a day or range request into missing values
+FETCH_ERRORS = (*GARMIN_REQUEST_ERRORS, KeyError, TypeError, ValueError)
+
+
+# ---------------------------------------------------------------------
+# Fan-out
+# ---------------------------------------------------------------------
+def fetch_day(api_method: Callable, parse: Callable, day: date) -> float | None:
+    """
+    Fetch and parse a single day's metric.
+    Returns None if the day cannot be fetched.
+    """
+    try:
+        return parse(api_method(day.isoformat()))
+    except FETCH_ERRORS:
+        return None
+
+
+@traced(category="garmin")
+def fetch_wellness_days(api: Garmin, days: List[date], metrics: List[str] | None = None, max_workers: int = WELLNESS_MAX_WORKERS) -> Dict[str, Dict[date, float | None]]:
+    """
+    Fetch per-day wellness metrics concurrently.
+    Parameters:
+        api: Authenticated Garmin client.
+        days: Days to fetch.
+        metrics: Keys of DAILY_ENDPOINTS to fetch (default: WELLNESS_METRICS).
+        max_workers: Maximum number of requests in flight.
+    Returns:
+        Mapping metric -> {day: value or None}.
+    """
+    metrics = metrics or list(WELLNESS_METRICS)
+    jobs = [(metric, day) for metric in metrics for day in days]
+
+    def run(job):
+        metric, day = job
+        method_name, parse = DAILY_ENDPOINTS[metric]
+        return fetch_day(getattr(api, method_name), parse, day)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        values = list(executor.map(run, jobs))
+
+    result: Dict[str, Dict[date, float | None]] = {metric: {} for metric in metrics}
+    for (metric, day), value in zip(jobs, values):
+        result[metric][day] = value
+    return result
+
+
+# ---------------------------------------------------------------------
+# Range Endpoints
+# ---------------------------------------------------------------------
+def fetch_sleep_score_range(api: Garmin, start: date, end: date) -> Dict[date, float | None]:
+    """
+    Fetch daily overall sleep scores for [start, end] in one request.
+    """
+    data = api.connectapi(f"/wellness-service/stats/daily/sleep/score/{start.isoformat()}/{end.isoformat()}")
+    return {date.fromisoformat(item["calendarDate"]): item.get("value") for item in data or []}
+
+
+def fetch_hrv_range(api: Garmin, start: date, end: date) -> Dict[date, float | None]:
+    """
+    Fetch last night's average HRV for every day in [start, end] in one request.
+    """
+    data = api.connectapi(f"/hrv-service/hrv/daily/{start.isoformat()}/{end.isoformat()}")
+    return {date.fromisoformat(item["calendarDate"]): item.get("lastNightAvg") for item in (data or {}).get("hrvSummaries") or []}
+
+
+def fetch_rhr_range(api: Garmin, start: date, end: date) -> Dict[date, float | None]:
+    """
+    Fetch resting heart rate for every day in [start, end] in one request
+    (the endpoint behind get_rhr_day, with a multi-day span).
+    """
+    data = api.connectapi(
+        f"/userstats-service/wellness/daily/{api.display_name}",
+        params={"fromDate": start.isoformat(), "untilDate": end.isoformat(), "metricId": 60},
+    )
+    values = (data or {}).get("allMetrics", {}).get("metricsMap", {}).get("WELLNESS_RESTING_HEART_RATE") or []
+    return {date.fromisoformat(item["calendarDate"]): item.get("value") for item in values if item.get("calendarDate")}
+
+
+# Metric name -> range fetcher
+RANGE_ENDPOINTS: Dict[str, Callable] = {
+    "sleep_score": fetch_sleep_score_range,
+    "hrv": fetch_hrv_range,
+    "rhr": fetch_rhr_range,
+}
+
+
+def get_chunks(days: List[date], size: int = WELLNESS_RANGE_DAYS) -> List[List[date]]:
+    """
+    Split the span covered by days into consecutive windows of at most size days.
+    Each window lists the requested days it contains (windows without any are dropped).
+    """
+    first, last = min(days), max(days)
+    wanted = set(days)
+    chunks = []
+    start = first
+    while start <= last:
+        window = [start + timedelta(days=i) for i in range(min(size, (last - start).days + 1))]
+        chunk = [day for day in window if day in wanted]
+        if chunk:
+            chunks.append(chunk)
+        start += timedelta(days=size)
+    return chunks
+
+
+@traced(category="garmin")
+def fetch_wellness_range(api: Garmin, days: List[date], metrics: List[str] | None = None, max_workers: int = WELLNESS_MAX_WORKERS) -> Dict[str, Dict[date, float | None]]:
+    """
+    Fetch wellness metrics for many days, preferring range endpoints.
+    Parameters:
+        api: Authenticated Garmin client.
+        days: Days to fetch.
+        metrics: Keys of DAILY_ENDPOINTS to fetch (default: WELLNESS_METRICS).
+        max_workers: Maximum number of requests in flight.
+    Returns:
+        Mapping metric -> {day: value or None}, like fetch_wellness_days.
+    Metrics without a range endpoint, and chunks whose range request fails,
+    fall back to per-day requests.
+    """
+    metrics = metrics or list(WELLNESS_METRICS)
+    result: Dict[str, Dict[date, float | None]] = {metric: dict.fromkeys(days) for metric in metrics}
+    if not days:
+        return result
+
+    jobs = [(metric, chunk) for metric in metrics if metric in RANGE_ENDPOINTS for chunk in get_chunks(days)]
+
+    def run(job):
+        metric, chunk = job
+        try:
+            return RANGE_ENDPOINTS[metric](api, chunk[0], chunk[-1])
+        except FETCH_ERRORS:
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        values = list(executor.map(run, jobs))
+
+    fallback: Dict[str, List[date]] = {metric: list(days) for metric in metrics if metric not in RANGE_ENDPOINTS}
+    for (metric, chunk), chunk_values in zip(jobs, values):
+        if chunk_values is None:
+            fallback.setdefault(metric, []).extend(chunk)
+            continue
+        for day in chunk:
+            result[metric][day] = chunk_values.get(day)
+
+    for metric, metric_days in fallback.items():
+        if metric_days:
+            result[metric].update(fetch_wellness_days(api, metric_days, [metric], max_workers)[metric])
+    return result
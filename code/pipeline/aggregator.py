@@ -7,21 +7,45 @@ Combines:
 - Calendar
 
 Returns a single flat dictionary ready for storage.
+
+Sources run as a dependency graph of stages: Calendar runs alongside
+Garmin, and Weather starts as soon as Garmin has produced the location
+and today's run, reusing them instead of logging into Garmin again.
 """
 
-from code.garmin.garmin_main import main as garmin_main
+from code.garmin.ratelimit import get_rate_limiter
+from code.garmin.session import get_garmin_api
+from code.garmin.extract import GARMIN_STAGES, merge_garmin_stats
 from code.weather.weather_main import main as weather_main
 from code.calendar.calendar_main import main as calendar_main
+from .dag import Stage, run_stages
 from .schema import enforce_schema
 
 
+def login_garmin():
+    return {"garmin_api": get_garmin_api()}
+
+
+PIPELINE_STAGES = [
+    Stage("garmin_login", login_garmin, outputs=["garmin_api"]),
+    *GARMIN_STAGES,
+    Stage("weather", lambda location_stats, today_run_stats: {"weather_data": weather_main(location_stats.get("location_coordinates"), today_run_stats.get("run_today_start_time"))},
+          inputs=["location_stats", "today_run_stats"], outputs=["weather_data"]),
+    Stage("calendar", lambda: {"calendar_data": calendar_main()}, outputs=["calendar_data"]),
+]
+
+
 def aggregate_all():
-    garmin_data = garmin_main()
+    values = run_stages(PIPELINE_STAGES)
+    print("Garmin cache -", values["garmin_api"].cache_summary())
+    print("Garmin rate limit -", get_rate_limiter().summary())
+
+    garmin_data = merge_garmin_stats(values)
     #print(garmin_data)
-    weather_data = weather_main()
+    weather_data = values["weather_data"]
     #print(weather_data)
-    calendar_data = calendar_main()
+    calendar_data = values["calendar_data"]
     #print(calendar_data)
 
     combined = garmin_data | weather_data | calendar_data
-    return enforce_schema(combined)
\ No newline at end of file
+    return enforce_schema(combined)
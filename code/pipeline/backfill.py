@@ -0,0 +1,145 @@
+"""
+Historical backfill over an arbitrary date range.
+
+Produces FINAL_SCHEMA rows for every day in [start, end] while sharing
+fetches across days:
+- one activity list request for the range and its four-week lookback
+- one concurrent wellness fan-out covering every day
+- one Open-Meteo request per distinct run location
+- one ranged event query per calendar
+Rows are collected in a columnar RowBatch and written with a single storage call.
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, List
+from garminconnect import Garmin
+from googleapiclient.errors import HttpError
+from code.garmin.ratelimit import get_rate_limiter
+from code.garmin.session import get_garmin_api
+from code.garmin.extract import extract_today_run_stats, extract_location_stats
+from code.garmin.rolling import RollingWindow, build_day_record
+from code.garmin.snapshot import ActivitySnapshot
+from code.garmin.utils import get_monday_four_weeks_ago, get_weekday_name, round_or_none
+from code.garmin.wellness import WELLNESS_METRICS, fetch_wellness_days, fetch_wellness_range
+from code.weather.constants import WEATHER_GRID_DEGREES
+from code.weather.weather_main import extract_weather_range, get_run_start_hour
+from code.calendar.calendar_main import extract_calendar_range
+from code.tracing import traced
+from .schema import RowBatch
+from .storage import save_batch
+
+
+def get_days(start: date, end: date) -> List[date]:
+    """
+    Return every day in [start, end].
+    """
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+# ---------------------------------------------------------------------
+# Garmin
+# ---------------------------------------------------------------------
+@traced(category="backfill")
+def backfill_garmin(api: Garmin, days: List[date]) -> Dict[date, Dict[str, Any]]:
+    """
+    Build Garmin features for every day from one snapshot and one wellness fan-out.
+    Rolling features are produced by advancing a RollingWindow day by day.
+    """
+    lookback_start = get_monday_four_weeks_ago(days[0])
+    history = get_days(lookback_start, days[-1])
+
+    snapshot = ActivitySnapshot.fetch(api, lookback_start, days[-1])
+    wellness = fetch_wellness_range(api, history)
+    training_status = fetch_wellness_days(api, days, ["training_status"])["training_status"]
+
+    def day_wellness(day):
+        return {metric: wellness[metric][day] for metric in WELLNESS_METRICS}
+
+    rolling = RollingWindow()
+    for day in history:
+        if day >= days[0]:
+            break
+        rolling.update(day, build_day_record(snapshot.on(day), day_wellness(day)))
+
+    garmin_data = {}
+    for day in days:
+        rolling.update(day, build_day_record(snapshot.on(day), day_wellness(day)))
+
+        try:
+            location_stats = extract_location_stats(api, snapshot, day)
+        except IndexError:
+            # No located run in the window
+            location_stats = {}
+
+        garmin_data[day] = {
+            "date": day.isoformat(),
+            "day_of_the_week": get_weekday_name(day),
+            "training_status": training_status[day],
+            "last_night_HRV": round_or_none(wellness["hrv"][day]),
+            "last_night_sleep_score": round_or_none(wellness["sleep_score"][day]),
+            "last_night_RHR": round_or_none(wellness["rhr"][day]),
+        } | extract_today_run_stats(api, snapshot, day) | rolling.features(day) | location_stats
+
+    return garmin_data
+
+
+# ---------------------------------------------------------------------
+# Weather
+# ---------------------------------------------------------------------
+@traced(category="backfill")
+def backfill_weather(garmin_data: Dict[date, Dict[str, Any]]) -> Dict[date, Dict[str, Any]]:
+    """
+    Fetch weather with one request per distinct run location.
+    Locations are grouped on a coarse grid, so small differences in
+    run start points do not split the range into separate requests.
+    """
+    groups: Dict[tuple, Dict[date, int | None]] = defaultdict(dict)
+    group_coords: Dict[tuple, tuple] = {}
+
+    for day, data in garmin_data.items():
+        coords = data.get("location_coordinates")
+        if not coords:
+            continue
+        key = (round(coords[0] / WEATHER_GRID_DEGREES), round(coords[1] / WEATHER_GRID_DEGREES))
+        group_coords.setdefault(key, coords)
+        groups[key][day] = get_run_start_hour(data.get("run_today_start_time"))
+
+    weather_data = {}
+    for key, run_hours in groups.items():
+        try:
+            weather_data.update(extract_weather_range(group_coords[key], run_hours))
+        except Exception as e:
+            print("Open-Meteo -", e)
+    return weather_data
+
+
+# ---------------------------------------------------------------------
+# Entry Point
+# ---------------------------------------------------------------------
+def backfill(start: date, end: date) -> RowBatch:
+    """
+    Produce and store FINAL_SCHEMA rows for every day in [start, end].
+    """
+    if start > end:
+        raise ValueError("Backfill start date must not be after the end date.")
+    days = get_days(start, end)
+
+    api = get_garmin_api()
+
+    garmin_data = backfill_garmin(api, days)
+    weather_data = backfill_weather(garmin_data)
+
+    try:
+        calendar_data = extract_calendar_range(days)
+    except HttpError as e:
+        print(e)
+        calendar_data = {}
+
+    rows = RowBatch(len(days))
+    for day in days:
+        rows.append(garmin_data[day], weather_data.get(day, {}), calendar_data.get(day, {}))
+    save_batch(rows)
+    print("Garmin cache -", api.cache_summary())
+    print("Garmin rate limit -", get_rate_limiter().summary())
+    return rows
@@ -0,0 +1,88 @@
+"""
+Dependency-aware stage executor.
+
+Each stage declares the values it needs and the values it produces.
+A stage starts on a worker thread as soon as all of its inputs exist,
+so independent stages overlap and dependents never wait for unrelated work.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Iterable, List
+from code.tracing import span
+
+
+class Stage:
+    """
+    A pipeline step with declared inputs and outputs.
+    func is called with the input values as keyword arguments and must
+    return a dict containing every declared output.
+    """
+
+    def __init__(self, name: str, func: Callable[..., Dict[str, Any]], inputs: Iterable[str] = (), outputs: Iterable[str] = ()):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r})"
+
+
+def validate_stages(stages: List[Stage], initial: Iterable[str] = ()) -> None:
+    """
+    Check that every input is produced exactly once, either initially or by a stage.
+    """
+    producers: Dict[str, str] = {name: "<initial>" for name in initial}
+    for stage in stages:
+        for output in stage.outputs:
+            if output in producers:
+                raise ValueError(f"'{output}' is produced by both {producers[output]} and {stage.name}.")
+            producers[output] = stage.name
+
+    for stage in stages:
+        missing = [name for name in stage.inputs if name not in producers]
+        if missing:
+            raise ValueError(f"Stage {stage.name} needs {missing}, which no stage produces.")
+
+
+def run_stage(stage: Stage, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Call a stage's function, traced as one span.
+    """
+    with span(stage.name, "stage"):
+        return stage.func(**inputs)
+
+
+def run_stages(stages: List[Stage], initial: Dict[str, Any] | None = None, max_workers: int | None = None) -> Dict[str, Any]:
+    """
+    Run stages concurrently in dependency order.
+    Returns:
+        All produced values (including the initial ones) by name.
+    A failing stage re-raises its exception once running stages have finished.
+    """
+    values: Dict[str, Any] = dict(initial or {})
+    validate_stages(stages, values)
+    pending = list(stages)
+
+    with ThreadPoolExecutor(max_workers=max_workers or max(1, len(stages))) as executor:
+        running = {}
+        while pending or running:
+            ready = [stage for stage in pending if all(name in values for name in stage.inputs)]
+            for stage in ready:
+                pending.remove(stage)
+                future = executor.submit(run_stage, stage, {name: values[name] for name in stage.inputs})
+                running[future] = stage
+
+            if not running:
+                raise RuntimeError(f"Stages {pending} can never run (dependency cycle).")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                outputs = future.result()
+                missing = [name for name in stage.outputs if name not in (outputs or {})]
+                if missing:
+                    raise ValueError(f"Stage {stage.name} did not produce {missing}.")
+                values.update({name: outputs[name] for name in stage.outputs})
+
+    return values
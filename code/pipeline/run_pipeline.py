@@ -5,22 +5,52 @@ Executes:
 1. Aggregation
 2. Storage
 
-Intended to be run daily.
+Intended to be run daily. With --from/--to it backfills
+every day in the given range instead. With --trace (or RUN_DATA_TRACE)
+a timing trace of stages and API calls is written (see code/tracing.py).
 """
 
+import argparse
+from datetime import date
+from code.tracing import enable_tracing, finish_tracing
 from .aggregator import aggregate_all
 from .storage import save_row
 
 
-def main() -> None:
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command line options.
+    """
+    parser = argparse.ArgumentParser(description="Run the running data pipeline.")
+    parser.add_argument("--from", dest="start", type=date.fromisoformat, help="Backfill start date (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", type=date.fromisoformat, help="Backfill end date (YYYY-MM-DD), defaults to --from")
+    parser.add_argument("--trace", nargs="?", const="", metavar="PATH", help="Write a Chrome trace of stages and API calls (default: data/traces/)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
     """
     Execute full pipeline.
     """
-    print("- - - Running Data Pipeline - - -")
-    row = aggregate_all()
-    print(row)
-    save_row(row)
-    print("Pipeline completed successfully.")
+    args = parse_args(argv)
+    if args.trace is not None:
+        enable_tracing(args.trace or None)
+
+    try:
+        if args.start:
+            from .backfill import backfill
+            print("- - - Running Data Backfill - - -")
+            rows = backfill(args.start, args.end or args.start)
+            print(f"Backfilled {len(rows)} days.")
+            return
+
+        print("- - - Running Data Pipeline - - -")
+        row = aggregate_all()
+        print(row)
+        save_row(row)
+        print("Pipeline completed successfully.")
+    finally:
+        finish_tracing()
 
 
 if __name__ == "__main__":
@@ -29,4 +59,4 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         print("Pipeline interrupted.")
     except Exception as e:
-        print("Pipeline failed:", e)
\ No newline at end of file
+        print("Pipeline failed:", e)
@@ -10,9 +10,13 @@ The schema ensures:
 - Stable column ordering
 - Deterministic CSV structure
 - Missing fields filled with None
+- Compact dtypes when the dataset is loaded for analysis
 """
 
-from typing import Dict, List
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+from code.garmin.config import DAYS_OF_THE_WEEK
 
 
 FINAL_SCHEMA: List[str] = [
@@ -103,12 +107,46 @@ FINAL_SCHEMA: List[str] = [
     # =========================
     "class_hours",
     "work_hours",
+    "busy_hours",
     "before_10am",
     "after_5pm",
     "upcoming_deadline_next_three_days",
     "gym_available",
 ]
 
+# Column kinds used by typed storage backends (all other columns are numeric)
+STRING_COLUMNS = {
+    "date", "day_of_the_week", "training_status", "run_today_start_time",
+    "location", "location_coordinates", "daily_sunrise", "daily_sunset",
+}
+BOOLEAN_COLUMNS = {
+    "run_today_boolean", "trip_in_the_last_two_weeks", "before_10am",
+    "after_5pm", "upcoming_deadline_next_three_days", "gym_available",
+}
+# Whole-number metrics (counts, scores, codes) and their nullable integer dtypes;
+# hourly_weather_code is not one, as its daily median may fall between two codes
+INTEGER_COLUMNS = {
+    "last_night_HRV": "Int16",
+    "last_night_sleep_score": "Int8",
+    "last_night_RHR": "Int16",
+    "run_today_duration_min": "Int16",
+    "run_today_training_load": "Int16",
+    "last_four_weeks_average_sleep_score": "Int8",
+    "last_four_weeks_average_HRV": "Int16",
+    "last_four_weeks_average_RHR": "Int16",
+    "days_since_last_run": "Int8",
+    "days_since_last_gym": "Int8",
+    "days_since_last_quality_session": "Int8",
+    "hourly_apparent_temperature": "Int8",
+    "daily_weather_code": "Int8",
+    "daily_daylight_duration": "Int8",
+    "daily_temperature_2m_max": "Int8",
+    "daily_temperature_2m_min": "Int8",
+    "daily_temperature_2m_mean": "Int8",
+    "daily_apparent_temperature_mean": "Int8",
+    "daily_precipitation_hours": "Int8",
+}
+
 
 def enforce_schema(data: Dict) -> Dict:
     """
@@ -118,4 +156,191 @@ def enforce_schema(data: Dict) -> Dict:
     - Extra keys → removed
     - Preserves column ordering
     """
-    return {key: data.get(key, None) for key in FINAL_SCHEMA}
\ No newline at end of file
+    return {key: data.get(key, None) for key in FINAL_SCHEMA}
+
+
+# ---------------------------------------------------------------------
+# Columnar Batches
+# ---------------------------------------------------------------------
+class RowBatch:
+    """
+    Column-major builder for many FINAL_SCHEMA rows.
+
+    Each column is a preallocated array (float64 with NaN for metrics,
+    values plus a missing mask for flags and INTEGER_COLUMNS, object for
+    strings), so
+    appending a row only writes the fields it has and no per-row dict
+    is kept. to_pandas() wraps the arrays without copying them.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.size = 0
+        self._capacity = max(1, capacity)
+        self._numeric = {column: np.full(self._capacity, np.nan) for column in FINAL_SCHEMA if column not in STRING_COLUMNS | BOOLEAN_COLUMNS | INTEGER_COLUMNS.keys()}
+        self._boolean = {column: (np.zeros(self._capacity, dtype=bool), np.ones(self._capacity, dtype=bool)) for column in FINAL_SCHEMA if column in BOOLEAN_COLUMNS}
+        self._integer = {column: (np.zeros(self._capacity, dtype=pd.api.types.pandas_dtype(dtype).numpy_dtype), np.ones(self._capacity, dtype=bool)) for column, dtype in INTEGER_COLUMNS.items()}
+        self._string = {column: np.full(self._capacity, None, dtype=object) for column in FINAL_SCHEMA if column in STRING_COLUMNS}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _grow(self) -> None:
+        extra = self._capacity
+        for column, values in self._numeric.items():
+            self._numeric[column] = np.concatenate([values, np.full(extra, np.nan)])
+        for column, (values, mask) in self._boolean.items():
+            self._boolean[column] = (np.concatenate([values, np.zeros(extra, dtype=bool)]), np.concatenate([mask, np.ones(extra, dtype=bool)]))
+        for column, (values, mask) in self._integer.items():
+            self._integer[column] = (np.concatenate([values, np.zeros(extra, dtype=values.dtype)]), np.concatenate([mask, np.ones(extra, dtype=bool)]))
+        for column, values in self._string.items():
+            self._string[column] = np.concatenate([values, np.full(extra, None, dtype=object)])
+        self._capacity += extra
+
+    def append(self, *sources: Dict) -> None:
+        """
+        Add one row built from partial source dicts.
+        Later sources override earlier ones (like dict merging);
+        missing fields stay None and unknown keys are ignored.
+        """
+        if self.size == self._capacity:
+            self._grow()
+        i = self.size
+
+        for source in sources:
+            for key, value in source.items():
+                if key in self._numeric:
+                    self._numeric[key][i] = np.nan if value is None else value
+                elif key in self._boolean:
+                    values, mask = self._boolean[key]
+                    values[i] = bool(value) if value is not None else False
+                    mask[i] = value is None
+                elif key in self._integer:
+                    values, mask = self._integer[key]
+                    values[i] = int(value) if value is not None else 0
+                    mask[i] = value is None
+                elif key in self._string:
+                    self._string[key][i] = value
+        self.size += 1
+
+    def get_column(self, column: str):
+        """
+        Return a column's first `size` values as a view
+        (a BooleanArray for flags, an IntegerArray for INTEGER_COLUMNS).
+        """
+        n = self.size
+        if column in self._numeric:
+            return self._numeric[column][:n]
+        if column in self._boolean:
+            values, mask = self._boolean[column]
+            return pd.arrays.BooleanArray(values[:n], mask[:n])
+        if column in self._integer:
+            values, mask = self._integer[column]
+            return pd.arrays.IntegerArray(values[:n], mask[:n])
+        return self._string[column][:n]
+
+    def to_pandas(self) -> pd.DataFrame:
+        """
+        Return the batch as a DataFrame in FINAL_SCHEMA order, sharing the column arrays.
+        """
+        return pd.DataFrame({column: self.get_column(column) for column in FINAL_SCHEMA}, copy=False)
+
+    def to_arrow(self):
+        """
+        Return the batch as a pyarrow Table (tuples are stored as strings, like the CSV).
+        """
+        import pyarrow as pa
+
+        arrays = {}
+        for column in FINAL_SCHEMA:
+            if column in self._numeric:
+                arrays[column] = pa.array(self.get_column(column), from_pandas=True)
+            elif column in self._boolean or column in self._integer:
+                values, mask = self._boolean.get(column) or self._integer[column]
+                arrays[column] = pa.array(values[:self.size], mask=mask[:self.size])
+            else:
+                arrays[column] = pa.array([None if value is None else str(value) for value in self.get_column(column)], type=pa.string())
+        return pa.table(arrays)
+
+    def to_rows(self) -> List[Dict]:
+        """
+        Return the batch as enforce_schema-style dicts (missing values as None).
+        """
+        columns = {}
+        for column in FINAL_SCHEMA:
+            if column in self._numeric:
+                values = self.get_column(column)
+                columns[column] = [None if missing else value for value, missing in zip(values.tolist(), np.isnan(values))]
+            elif column in self._boolean or column in self._integer:
+                values, mask = self._boolean.get(column) or self._integer[column]
+                columns[column] = [None if missing else value for value, missing in zip(values[:self.size].tolist(), mask[:self.size])]
+            else:
+                columns[column] = self.get_column(column).tolist()
+        return [dict(zip(FINAL_SCHEMA, row)) for row in zip(*columns.values())]
+
+
+# ---------------------------------------------------------------------
+# Typed Loading
+# ---------------------------------------------------------------------
+CATEGORY_COLUMNS = {"day_of_the_week", "location", "training_status"}
+
+# location_coordinates is stored as a "(lat, lon)" string and loaded as two columns
+COORDINATE_COLUMNS = ["location_latitude", "location_longitude"]
+
+
+def get_column_dtype(column: str) -> Any:
+    """
+    Return the in-memory dtype of a stored column, or None to keep
+    it as read (dates, times of day and coordinates are converted separately).
+    """
+    if column == "day_of_the_week":
+        return pd.CategoricalDtype(list(DAYS_OF_THE_WEEK.values()), ordered=True)
+    if column in CATEGORY_COLUMNS:
+        return "category"
+    if column in BOOLEAN_COLUMNS:
+        return "boolean"
+    if column in STRING_COLUMNS:
+        return None
+    if column in INTEGER_COLUMNS:
+        return INTEGER_COLUMNS[column]
+    return "float32"
+
+
+DATASET_DTYPES: Dict[str, Any] = {
+    column: get_column_dtype(column)
+    for column in FINAL_SCHEMA
+    if get_column_dtype(column) is not None
+}
+
+
+def split_coordinates(coordinates: pd.Series) -> pd.DataFrame:
+    """
+    Split "(lat, lon)" strings into float32 latitude/longitude columns.
+    """
+    parts = coordinates.astype("object").str.extract(r"\(\s*([^,]+),\s*([^)]+)\)")
+    parts.columns = COORDINATE_COLUMNS
+    return parts.astype("float32")
+
+
+def apply_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a loaded dataset to compact dtypes:
+        - categoricals for day, location and training status
+        - nullable booleans for flags
+        - nullable small integers for counts, scores and codes
+        - float32 for real-valued metrics
+        - datetime64 dates
+        - location_coordinates split into latitude/longitude
+    """
+    for column, dtype in DATASET_DTYPES.items():
+        if column in df.columns:
+            df[column] = df[column].astype(dtype)
+
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d")
+
+    if "location_coordinates" in df.columns:
+        position = df.columns.get_loc("location_coordinates")
+        parts = split_coordinates(df.pop("location_coordinates"))
+        for offset, column in enumerate(COORDINATE_COLUMNS):
+            df.insert(position + offset, column, parts[column])
+    return df
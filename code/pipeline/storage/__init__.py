@@ -0,0 +1,74 @@
+"""
+Storage layer.
+
+Persists aggregated rows through the backend selected with the
+RUN_DATA_STORAGE environment variable:
+- csv (default): single CSV file
+- parquet: month-partitioned Parquet files
+- sqlite: SQLite table keyed by date
+"""
+
+import os
+from types import ModuleType
+from typing import Dict, List
+import pandas as pd
+from code.tracing import traced
+from ..schema import RowBatch
+from .csv_store import DATA_PATH, create_csv_if_missing
+
+
+STORAGE_BACKEND = os.getenv("RUN_DATA_STORAGE", "csv")
+
+
+def get_backend(name: str = STORAGE_BACKEND) -> ModuleType:
+    """
+    Return the storage backend module by name.
+    Optional backends are imported on first use.
+    """
+    if name == "csv":
+        from . import csv_store
+        return csv_store
+    if name == "parquet":
+        from . import parquet_store
+        return parquet_store
+    if name == "sqlite":
+        from . import sqlite_store
+        return sqlite_store
+    raise ValueError(f"Unknown storage backend: {name}")
+
+
+@traced(category="storage")
+def save_row(row: Dict) -> None:
+    """
+    Save a single aggregated row, replacing any row with the same date.
+    """
+    get_backend().save_row(row)
+
+
+@traced(category="storage")
+def save_rows(rows: List[Dict]) -> None:
+    """
+    Save many aggregated rows, replacing rows with the same dates.
+    """
+    get_backend().save_rows(rows)
+
+
+@traced(category="storage")
+def save_batch(batch: RowBatch) -> None:
+    """
+    Save a columnar batch of rows, replacing rows with the same dates.
+    Backends with a DataFrame writer take the batch without building row dicts.
+    """
+    backend = get_backend()
+    if hasattr(backend, "save_frame"):
+        backend.save_frame(batch.to_pandas())
+    else:
+        backend.save_rows(batch.to_rows())
+
+
+def load_dataset(columns: List[str] | None = None, start: str | None = None, end: str | None = None) -> pd.DataFrame:
+    """
+    Load the stored dataset with compact dtypes, optionally limited
+    to some columns and an inclusive ISO date range.
+    """
+    return get_backend().load_dataset(columns, start, end)
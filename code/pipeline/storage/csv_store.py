@@ -0,0 +1,273 @@
+"""
+CSV storage backend.
+
+Handles CSV persistence of dataset.
+
+Rows are kept sorted by date, one line per row. A sidecar index
+(running_dataset.csv.idx) stores the byte offset of every row in
+fixed-width records, so:
+- a row newer than the last one is appended directly (O(1)),
+  reading only the last index entry
+- an out-of-order or duplicate date is located by bisecting the index
+  on disk, and only the file from the first affected row onwards is
+  rewritten
+- date range reads only parse the matching slice of the file
+"""
+
+import io
+import os
+import numpy as np
+import pandas as pd
+from typing import BinaryIO, Dict, List, Tuple
+from ..schema import FINAL_SCHEMA, INTEGER_COLUMNS, DATASET_DTYPES, apply_dtypes
+
+
+DATA_PATH = "data/running_dataset.csv"
+
+# "YYYY-MM-DD <12-digit offset>\n"
+INDEX_RECORD_SIZE = 24
+
+
+def get_index_path() -> str:
+    return DATA_PATH + ".idx"
+
+
+def create_csv_if_missing() -> None:
+    """
+    Create empty CSV with header if not exists.
+    """
+    if not os.path.exists(DATA_PATH):
+        os.makedirs(os.path.dirname(DATA_PATH), exist_ok=True)
+        df = pd.DataFrame(columns=FINAL_SCHEMA)
+        df.to_csv(DATA_PATH, index=False)
+
+
+def read_header() -> List[str]:
+    with open(DATA_PATH) as f:
+        return f.readline().rstrip("\n").split(",")
+
+
+def upgrade_csv_header() -> None:
+    """
+    Rewrite a CSV written before columns were added to FINAL_SCHEMA
+    under the current header. Stored values are kept exactly as written
+    and new columns are left empty; runs once per schema change.
+    """
+    if read_header() == FINAL_SCHEMA:
+        return
+    df = pd.read_csv(DATA_PATH, dtype=str, keep_default_na=False)
+    tmp_path = DATA_PATH + ".tmp"
+    df.reindex(columns=FINAL_SCHEMA, fill_value="").to_csv(tmp_path, index=False, lineterminator="\n")
+    os.replace(tmp_path, DATA_PATH)
+    if os.path.exists(get_index_path()):
+        os.remove(get_index_path())
+
+
+def format_lines(df: pd.DataFrame) -> List[bytes]:
+    """
+    Format FINAL_SCHEMA rows as CSV lines exactly as pandas writes them.
+    INTEGER_COLUMNS are written as whole numbers (50, not 50.0) whether
+    the rows came from dicts or from a RowBatch.
+    """
+    df = df.astype({column: dtype for column, dtype in INTEGER_COLUMNS.items() if column in df.columns})
+    text = df.to_csv(header=False, index=False, lineterminator="\n")
+    return [line.encode() for line in io.StringIO(text)]
+
+
+# ---------------------------------------------------------------------
+# Date Index
+# ---------------------------------------------------------------------
+def format_index_record(row_date: str, offset: int) -> bytes:
+    return f"{row_date} {offset:012d}\n".encode()
+
+
+def read_index_entry(index: BinaryIO, position: int) -> Tuple[str, int]:
+    """
+    Read the (date, byte offset) index entry at a position.
+    """
+    index.seek(position * INDEX_RECORD_SIZE)
+    record = index.read(INDEX_RECORD_SIZE)
+    return record[:10].decode(), int(record[11:23])
+
+
+def count_index_entries(index: BinaryIO) -> int:
+    return index.seek(0, os.SEEK_END) // INDEX_RECORD_SIZE
+
+
+def find_index_position(index: BinaryIO, row_date: str, after: bool = False) -> int:
+    """
+    Bisect the index on disk for row_date, seeking to O(log n) entries.
+    Returns the first position whose date is >= row_date
+    (> row_date when after is True), like bisect_left / bisect_right.
+    Dates after the last entry (appends) only read the last entry.
+    """
+    def goes_before(position):
+        entry_date = read_index_entry(index, position)[0]
+        return entry_date <= row_date if after else entry_date < row_date
+
+    low, high = 0, count_index_entries(index)
+    if high == 0 or goes_before(high - 1):
+        return high
+    high -= 1
+    while low < high:
+        middle = (low + high) // 2
+        if goes_before(middle):
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def write_index_from(position: int, entries: List[Tuple[str, int]]) -> None:
+    """
+    Replace index entries from a given position onwards.
+    """
+    with open(get_index_path(), "r+b" if os.path.exists(get_index_path()) else "w+b") as f:
+        f.seek(position * INDEX_RECORD_SIZE)
+        f.truncate()
+        f.write(b"".join(format_index_record(row_date, offset) for row_date, offset in entries))
+
+
+def rebuild_index() -> None:
+    """
+    Scan the CSV once and rewrite the whole index.
+    """
+    entries = []
+    with open(DATA_PATH, "rb") as f:
+        f.readline()
+        offset = f.tell()
+        for line in f:
+            entries.append((line.split(b",", 1)[0].decode(), offset))
+            offset += len(line)
+    write_index_from(0, entries)
+
+
+def index_is_valid() -> bool:
+    """
+    Cheap consistency check: the last index entry must point at the
+    last line of the CSV, which must end exactly at end of file.
+    """
+    if not os.path.exists(get_index_path()):
+        return False
+    index_size = os.path.getsize(get_index_path())
+    if index_size % INDEX_RECORD_SIZE:
+        return False
+
+    with open(DATA_PATH, "rb") as f:
+        if index_size == 0:
+            f.readline()
+            return f.read(1) == b""
+        with open(get_index_path(), "rb") as index:
+            index.seek(index_size - INDEX_RECORD_SIZE)
+            record = index.read(INDEX_RECORD_SIZE)
+        f.seek(int(record[11:23]))
+        tail = f.read()
+    return tail.startswith(record[:10] + b",") and tail.count(b"\n") == 1 and tail.endswith(b"\n")
+
+
+def ensure_index() -> None:
+    """
+    Rebuild the index if it is missing or stale.
+    """
+    if not index_is_valid():
+        rebuild_index()
+
+
+def locate(row_date: str | None, after: bool = False) -> Tuple[int, int]:
+    """
+    Return the index position and CSV byte offset at which rows for
+    row_date start (after=False) or end (after=True).
+    None means the end of the file.
+    """
+    with open(get_index_path(), "rb") as index:
+        count = count_index_entries(index)
+        position = count if row_date is None else find_index_position(index, row_date, after)
+        if position < count:
+            return position, read_index_entry(index, position)[1]
+    return position, os.path.getsize(DATA_PATH)
+
+
+# ---------------------------------------------------------------------
+# Writes
+# ---------------------------------------------------------------------
+def save_frame(df: pd.DataFrame) -> None:
+    """
+    Save FINAL_SCHEMA rows to CSV, replacing rows with the same dates.
+
+    Rows newer than the stored history are appended; otherwise the file
+    is rewritten from the first affected row only.
+    """
+    if df.empty:
+        return
+    create_csv_if_missing()
+    upgrade_csv_header()
+
+    new_lines = dict(zip(df["date"], format_lines(df)))
+    ensure_index()
+    position, offset = locate(min(new_lines))
+
+    with open(DATA_PATH, "r+b") as f:
+        f.seek(offset)
+        tail = {line.split(b",", 1)[0].decode(): line for line in f}
+        merged = tail | new_lines
+
+        f.seek(offset)
+        f.truncate()
+        new_entries = []
+        for row_date in sorted(merged):
+            new_entries.append((row_date, f.tell()))
+            f.write(merged[row_date])
+
+    write_index_from(position, new_entries)
+
+
+def save_rows(rows: List[Dict]) -> None:
+    """
+    Save aggregated rows to CSV, replacing rows with the same dates.
+    """
+    if rows:
+        save_frame(pd.DataFrame(rows, columns=FINAL_SCHEMA))
+
+
+def save_row(row: Dict) -> None:
+    """
+    Save a single aggregated row to CSV.
+
+    Avoids duplicate date entries.
+    """
+    save_rows([row])
+
+
+# ---------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------
+def load_dataset(columns: List[str] | None = None, start: str | None = None, end: str | None = None) -> pd.DataFrame:
+    """
+    Read the dataset as a typed pandas DataFrame (see schema.apply_dtypes).
+    Parameters:
+        columns: FINAL_SCHEMA columns to read (default: all).
+        start, end: Optional inclusive ISO date bounds; only the byte
+            range holding those rows is parsed.
+    """
+    columns = columns or FINAL_SCHEMA
+    if not os.path.exists(DATA_PATH):
+        return apply_dtypes(pd.DataFrame(columns=columns))
+
+    ensure_index()
+    begin = locate(start)[1] if start is not None else None
+    stop = locate(end, after=True)[1]
+
+    with open(DATA_PATH, "rb") as f:
+        header = f.readline()
+        if begin is not None:
+            f.seek(begin)
+        body = f.read(max(0, stop - f.tell()))
+
+    # Columns added to FINAL_SCHEMA after the file was written read as missing
+    stored = [column for column in columns if column in read_header()]
+    df = pd.read_csv(
+        io.BytesIO(header + body),
+        usecols=stored,
+        dtype={column: dtype for column, dtype in DATASET_DTYPES.items() if column in stored},
+    )
+    return apply_dtypes(df.reindex(columns=columns))
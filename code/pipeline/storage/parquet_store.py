@@ -0,0 +1,117 @@
+"""
+Partitioned Parquet storage backend.
+
+Rows are stored in one Parquet file per month:
+
+    data/running_dataset/month=YYYY-MM/data.parquet
+
+Upserting a day rewrites only its month's partition, so write cost does
+not grow with the length of the history. Readers get typed columns,
+column projection and date-range pruning over the partitions.
+"""
+
+import os
+from collections import defaultdict
+from typing import Dict, List
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from ..schema import FINAL_SCHEMA, STRING_COLUMNS, BOOLEAN_COLUMNS, apply_dtypes
+
+
+PARQUET_DIR = "data/running_dataset"
+
+ARROW_SCHEMA = pa.schema([
+    (column, pa.string() if column in STRING_COLUMNS else pa.bool_() if column in BOOLEAN_COLUMNS else pa.float64())
+    for column in FINAL_SCHEMA
+])
+
+
+def get_partition_path(month: str) -> str:
+    """
+    Return the Parquet file holding a given month (YYYY-MM).
+    """
+    return os.path.join(PARQUET_DIR, f"month={month}", "data.parquet")
+
+
+def to_arrow_row(row: Dict) -> Dict:
+    """
+    Coerce a row to the Arrow schema (tuples are stored as strings, like the CSV).
+    """
+    return {
+        column: str(row.get(column)) if column in STRING_COLUMNS and row.get(column) is not None else row.get(column)
+        for column in FINAL_SCHEMA
+    }
+
+
+def write_partition(month: str, rows: List[Dict]) -> None:
+    """
+    Atomically replace one month's partition.
+    """
+    path = get_partition_path(month)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pylist(sorted(rows, key=lambda row: row["date"]), schema=ARROW_SCHEMA)
+    # Leading underscore: ignored by dataset discovery if left behind
+    tmp_path = os.path.join(os.path.dirname(path), "_data.parquet.tmp")
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def save_rows(rows: List[Dict]) -> None:
+    """
+    Upsert rows by date, touching only the affected month partitions.
+    """
+    by_month: Dict[str, Dict[str, Dict]] = defaultdict(dict)
+    for row in rows:
+        by_month[row["date"][:7]][row["date"]] = to_arrow_row(row)
+
+    for month, new_rows in by_month.items():
+        path = get_partition_path(month)
+        existing = pq.read_table(path).to_pylist() if os.path.exists(path) else []
+        merged = {row["date"]: row for row in existing} | new_rows
+        write_partition(month, list(merged.values()))
+
+
+def save_row(row: Dict) -> None:
+    """
+    Upsert a single row by date.
+    """
+    save_rows([row])
+
+
+def load_table(columns: List[str] | None = None, start: str | None = None, end: str | None = None) -> pa.Table:
+    """
+    Read the dataset as an Arrow table.
+    Parameters:
+        columns: Columns to read (default: all).
+        start, end: Optional inclusive ISO date bounds; only matching
+            month partitions are opened.
+    """
+    if not os.path.exists(PARQUET_DIR):
+        return ARROW_SCHEMA.empty_table().select(columns or FINAL_SCHEMA)
+
+    partitioning = ds.partitioning(pa.schema([("month", pa.string())]), flavor="hive")
+    dataset = ds.dataset(PARQUET_DIR, format="parquet", schema=ARROW_SCHEMA.append(pa.field("month", pa.string())), partitioning=partitioning)
+    condition = None
+    if start is not None:
+        condition = (ds.field("month") >= start[:7]) & (ds.field("date") >= start)
+    if end is not None:
+        upper = (ds.field("month") <= end[:7]) & (ds.field("date") <= end)
+        condition = upper if condition is None else condition & upper
+
+    table = dataset.to_table(columns=columns or FINAL_SCHEMA, filter=condition)
+    return table.sort_by("date") if "date" in table.column_names else table
+
+
+def load_dataset(columns: List[str] | None = None, start: str | None = None, end: str | None = None):
+    """
+    Read the dataset as a typed pandas DataFrame (see load_table and schema.apply_dtypes).
+    """
+    return apply_dtypes(load_table(columns, start, end).to_pandas())
+
+
+def export_csv(path: str) -> None:
+    """
+    Export the full dataset to a CSV file.
+    """
+    load_table().to_pandas().to_csv(path, index=False)
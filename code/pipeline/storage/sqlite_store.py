@@ -0,0 +1,156 @@
+"""
+SQLite storage backend.
+
+Rows live in a single `dataset` table keyed by date:
+- typed columns (TEXT / INTEGER booleans and counts / REAL metrics)
+- INSERT ... ON CONFLICT upserts, so a day is replaced in place
+- WAL mode and IMMEDIATE transactions, so concurrent pipeline
+  processes can write safely while readers keep reading
+- date range reads use the primary key index
+"""
+
+import os
+import sqlite3
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from ..schema import FINAL_SCHEMA, STRING_COLUMNS, BOOLEAN_COLUMNS, INTEGER_COLUMNS, apply_dtypes
+
+
+SQLITE_PATH = "data/running_dataset.sqlite"
+
+# Seconds a writer waits for another process holding the write lock
+BUSY_TIMEOUT_SECONDS = 30.0
+
+
+def get_column_type(column: str) -> str:
+    if column in STRING_COLUMNS:
+        return "TEXT"
+    if column in BOOLEAN_COLUMNS or column in INTEGER_COLUMNS:
+        return "INTEGER"
+    return "REAL"
+
+
+def connect() -> sqlite3.Connection:
+    """
+    Open the database, creating the table (and any columns added to
+    FINAL_SCHEMA since it was created) if needed.
+    """
+    os.makedirs(os.path.dirname(SQLITE_PATH), exist_ok=True)
+    conn = sqlite3.connect(SQLITE_PATH, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+    columns = ", ".join(
+        f'"{column}" TEXT PRIMARY KEY' if column == "date" else f'"{column}" {get_column_type(column)}'
+        for column in FINAL_SCHEMA
+    )
+    conn.execute(f"CREATE TABLE IF NOT EXISTS dataset ({columns})")
+
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(dataset)")}
+    for column in FINAL_SCHEMA:
+        if column not in existing:
+            conn.execute(f'ALTER TABLE dataset ADD COLUMN "{column}" {get_column_type(column)}')
+    return conn
+
+
+def to_sql_value(column: str, value):
+    """
+    Coerce a row value to an SQLite-bindable value (tuples are stored as strings, like the CSV).
+    """
+    if value is None:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if column in BOOLEAN_COLUMNS:
+        return int(bool(value))
+    if column in INTEGER_COLUMNS:
+        return int(value)
+    if column in STRING_COLUMNS:
+        return str(value)
+    return value
+
+
+UPSERT_SQL = (
+    "INSERT INTO dataset ({columns}) VALUES ({placeholders}) "
+    "ON CONFLICT(date) DO UPDATE SET {updates}"
+).format(
+    columns=", ".join(f'"{column}"' for column in FINAL_SCHEMA),
+    placeholders=", ".join("?" for _ in FINAL_SCHEMA),
+    updates=", ".join(f'"{column}" = excluded."{column}"' for column in FINAL_SCHEMA if column != "date"),
+)
+
+
+def save_rows(rows: List[Dict]) -> None:
+    """
+    Upsert rows by date in a single transaction.
+    """
+    if not rows:
+        return
+    values = [tuple(to_sql_value(column, row.get(column)) for column in FINAL_SCHEMA) for row in rows]
+
+    conn = connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(UPSERT_SQL, values)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+
+def save_row(row: Dict) -> None:
+    """
+    Upsert a single row by date.
+    """
+    save_rows([row])
+
+
+def read_frame(columns: List[str] | None = None, start: str | None = None, end: str | None = None) -> pd.DataFrame:
+    """
+    Read stored rows as a pandas DataFrame ordered by date.
+    Parameters:
+        columns: Columns to read (default: all).
+        start, end: Optional inclusive ISO date bounds, resolved through
+            the primary key index.
+    """
+    columns = columns or FINAL_SCHEMA
+    conditions, params = [], []
+    if start is not None:
+        conditions.append("date >= ?")
+        params.append(start)
+    if end is not None:
+        conditions.append("date <= ?")
+        params.append(end)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    selected = ", ".join(f'"{column}"' for column in columns)
+
+    conn = connect()
+    try:
+        df = pd.read_sql_query(
+            f"SELECT {selected} FROM dataset{where} ORDER BY date",
+            conn, params=params,
+        )
+    finally:
+        conn.close()
+
+    for column in BOOLEAN_COLUMNS.intersection(df.columns):
+        df[column] = df[column].astype("boolean")
+    return df
+
+
+def load_dataset(columns: List[str] | None = None, start: str | None = None, end: str | None = None) -> pd.DataFrame:
+    """
+    Read the dataset as a typed pandas DataFrame (see read_frame and schema.apply_dtypes).
+    """
+    return apply_dtypes(read_frame(columns, start, end))
+
+
+def export_csv(path: str) -> None:
+    """
+    Export the full dataset to a CSV file.
+    """
+    read_frame().to_csv(path, index=False)
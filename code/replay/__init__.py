@@ -0,0 +1,85 @@
+"""
+Record/replay layer for the external services.
+
+Selected with the RUN_DATA_REPLAY environment variable:
+- record: the real Garmin, Open-Meteo and Google Calendar clients are
+  wrapped and every response is saved as a fixture
+- replay: the client builders return local stand-ins serving those
+  fixtures, so the pipeline runs offline and deterministically
+
+Replay conditions:
+- REPLAY_LATENCY_MS: delay added to every stand-in call
+- REPLAY_JITTER_MS: extra uniformly random delay
+- REPLAY_ERROR_RATE: share of calls failing with an injected 503
+- REPLAY_SEED: seed for jitter and error injection
+
+Local state that would change which requests are sent (the Garmin
+response cache, the calendar event store and calendar ID cache) is
+kept in a fresh temporary directory while recording or replaying, so
+both runs send the same requests.
+
+Fixtures live in RUN_DATA_FIXTURES (default data/fixtures), with the
+day they were recorded. Replays pin RUN_DATA_TODAY to that day when the
+first stand-in is built, unless it is already set.
+"""
+
+import os
+import tempfile
+from .fixtures import FixtureStore, ReplayConditions
+
+
+REPLAY_MODE = os.getenv("RUN_DATA_REPLAY", "")
+FIXTURES_DIR = os.getenv("RUN_DATA_FIXTURES", os.path.join("data", "fixtures"))
+
+_STORES = {}
+_CONDITIONS: ReplayConditions | None = None
+_STATE_DIR: str | None = None
+
+
+def get_replay_mode() -> str:
+    """
+    Return "record", "replay" or "" (live services).
+    """
+    if REPLAY_MODE not in ("", "record", "replay"):
+        raise ValueError(f"Unknown replay mode: {REPLAY_MODE}")
+    return REPLAY_MODE
+
+
+def get_fixture_store(source: str) -> FixtureStore:
+    """
+    Return the process-wide fixture store of one source (garmin, openmeteo, calendar).
+    """
+    if source not in _STORES:
+        store = FixtureStore(os.path.join(FIXTURES_DIR, f"{source}.json"), recording=get_replay_mode() == "record")
+        if get_replay_mode() == "replay" and store.recorded_on:
+            os.environ.setdefault("RUN_DATA_TODAY", store.recorded_on)
+        _STORES[source] = store
+    return _STORES[source]
+
+
+def get_replay_conditions() -> ReplayConditions:
+    """
+    Return the process-wide latency/error settings for stand-ins.
+    """
+    global _CONDITIONS
+    if _CONDITIONS is None:
+        _CONDITIONS = ReplayConditions(
+            latency_ms=float(os.getenv("REPLAY_LATENCY_MS", "0")),
+            jitter_ms=float(os.getenv("REPLAY_JITTER_MS", "0")),
+            error_rate=float(os.getenv("REPLAY_ERROR_RATE", "0")),
+            seed=int(os.getenv("REPLAY_SEED", "0")),
+        )
+    return _CONDITIONS
+
+
+def get_state_path(path: str) -> str:
+    """
+    Return where a local state file lives: unchanged for live runs,
+    in the run's temporary directory while recording or replaying.
+    """
+    global _STATE_DIR
+    if not get_replay_mode():
+        return path
+    if _STATE_DIR is None:
+        _STATE_DIR = tempfile.mkdtemp(prefix="run_data_replay_")
+    return os.path.join(_STATE_DIR, os.path.basename(path))
@@ -0,0 +1,99 @@
+"""
+Fixture files and replay conditions shared by the stand-ins.
+
+A fixture file maps a canonical request key to the list of responses
+recorded for it, in order. Replaying a key returns those responses in
+the same order and keeps repeating the last one.
+"""
+
+import atexit
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+from code.garmin.utils import get_today_date
+
+
+def make_key(*parts) -> str:
+    """
+    Build a canonical request key (stable across runs and argument order).
+    """
+    return json.dumps(parts, sort_keys=True, default=str)
+
+
+class FixtureStore:
+    """
+    Recorded responses of one service, loaded from and saved to a JSON file.
+    """
+
+    def __init__(self, path: str, recording: bool = False):
+        self.path = path
+        self._lock = threading.Lock()
+        self._replayed: Dict[str, int] = defaultdict(int)
+        self.responses: Dict[str, List[Any]] = {}
+        self.recorded_on: str | None = None
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            self.responses = data.get("responses", {})
+            self.recorded_on = data.get("recorded_on")
+        if recording:
+            self.responses = {}
+            self.recorded_on = get_today_date().isoformat()
+            atexit.register(self.save)
+
+    def record(self, key: str, payload: Any) -> None:
+        with self._lock:
+            self.responses.setdefault(key, []).append(payload)
+
+    def replay(self, key: str) -> tuple:
+        """
+        Return (found, payload) for the next response recorded under key.
+        """
+        with self._lock:
+            recorded = self.responses.get(key)
+            if not recorded:
+                return False, None
+            index = min(self._replayed[key], len(recorded) - 1)
+            self._replayed[key] += 1
+            return True, recorded[index]
+
+    def save(self) -> None:
+        """
+        Atomically write the fixture file.
+        """
+        with self._lock:
+            data = {"recorded_on": self.recorded_on, "responses": self.responses}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+
+class ReplayConditions:
+    """
+    Latency and error injection applied to every stand-in call.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def apply(self) -> bool:
+        """
+        Sleep for the configured latency.
+        Returns True if this call should fail with an injected error.
+        """
+        with self._lock:
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            fail = self._random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay / 1000)
+        return fail
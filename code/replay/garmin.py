@@ -0,0 +1,97 @@
+"""
+Garmin Connect recording proxy and local stand-in.
+
+Recording happens at the client-method level (get_sleep_data,
+connectapi, ...), below the cache. The stand-in has no HTTP layer, so
+each replayed call takes one token from the shared rate limiter, and
+replays exercise both the cache and the limiter.
+"""
+
+from typing import Any
+from garminconnect import Garmin, GarminConnectConnectionError
+from code.garmin.ratelimit import get_rate_limiter, get_status_code
+from code.tracing import record_payload
+from .fixtures import FixtureStore, ReplayConditions, make_key
+
+
+# Client attributes (not methods) the pipeline reads
+RECORDED_ATTRIBUTES = ("display_name", "full_name")
+
+
+class FakeResponse:
+    """
+    Minimal HTTP response carried by replayed errors, so the rate
+    limiter classifies them like real ones.
+    """
+
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.headers = {}
+
+
+def make_error(message: str, status_code: int | None) -> GarminConnectConnectionError:
+    error = GarminConnectConnectionError(message)
+    error.response = FakeResponse(status_code) if status_code else None
+    return error
+
+
+class RecordingGarmin:
+    """
+    Proxy around a real Garmin client saving every method result
+    (or failure) to the fixture store.
+    """
+
+    def __init__(self, api: Garmin, store: FixtureStore):
+        self._api = api
+        self._store = store
+        for name in RECORDED_ATTRIBUTES:
+            store.record(make_key("attribute", name), getattr(api, name, None))
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._api, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            key = make_key(name, args, kwargs)
+            try:
+                result = attr(*args, **kwargs)
+            except Exception as e:
+                self._store.record(key, {"error": str(e), "status_code": get_status_code(e)})
+                raise
+            self._store.record(key, {"result": result})
+            return result
+        return call
+
+
+class ReplayGarmin:
+    """
+    Local stand-in for a Garmin client serving recorded responses.
+    Unrecorded calls fail like an unreachable server (no status code),
+    injected errors like an overloaded one (503).
+    """
+
+    def __init__(self, store: FixtureStore, conditions: ReplayConditions):
+        self._store = store
+        self._conditions = conditions
+        for name in RECORDED_ATTRIBUTES:
+            setattr(self, name, store.replay(make_key("attribute", name))[1])
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def replay(*args, **kwargs):
+            if self._conditions.apply():
+                raise make_error(f"Injected error in {name}", 503)
+            found, recorded = self._store.replay(make_key(name, args, kwargs))
+            if not found:
+                raise make_error(f"No fixture for {name}{args}", None)
+            if "error" in recorded:
+                raise make_error(recorded["error"], recorded["status_code"])
+            record_payload(recorded["result"])
+            return recorded["result"]
+
+        def call(*args, **kwargs):
+            return get_rate_limiter().call(replay, *args, **kwargs)
+        return call
@@ -0,0 +1,182 @@
+"""
+Google Calendar recording proxy and local stand-in.
+
+Recording happens at the request level (resource, method and keyword
+arguments), not on the wire: batch bodies carry random MIME boundaries
+and content IDs, so raw HTTP exchanges would never replay identically.
+Requests added to a batch are recorded (and replayed) individually.
+"""
+
+from typing import Any, Callable, Dict
+import httplib2
+from googleapiclient.errors import HttpError
+from .fixtures import FixtureStore, ReplayConditions, make_key
+
+
+# Resource methods returning a request (the others return collections)
+REQUEST_METHODS = ("list", "get", "instances")
+
+
+def make_http_error(status: int, message: str, uri: str = "") -> HttpError:
+    return HttpError(httplib2.Response({"status": status}), message.encode(), uri=uri)
+
+
+# ---------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------
+class RecordingRequest:
+    """
+    Proxy around an HttpRequest saving its response (or HTTP error).
+    """
+
+    def __init__(self, request, key: str, store: FixtureStore):
+        self.request = request
+        self.uri = getattr(request, "uri", None)
+        self.key = key
+        self._store = store
+
+    def record(self, response: Any, exception: Exception | None) -> None:
+        if isinstance(exception, HttpError):
+            self._store.record(self.key, {"status": exception.resp.status, "error": exception.content.decode(errors="replace")})
+        elif exception is None:
+            self._store.record(self.key, {"result": response})
+
+    def execute(self, *args, **kwargs) -> Any:
+        try:
+            response = self.request.execute(*args, **kwargs)
+        except HttpError as e:
+            self.record(None, e)
+            raise
+        self.record(response, None)
+        return response
+
+
+class RecordingBatch:
+    """
+    Proxy around a BatchHttpRequest recording every member request.
+    """
+
+    def __init__(self, batch):
+        self._batch = batch
+
+    def add(self, request: RecordingRequest, callback: Callable | None = None, request_id: str | None = None) -> None:
+        # The batch-level callback still runs after this per-request one
+        def record(request_id, response, exception):
+            request.record(response, exception)
+            if callback is not None:
+                callback(request_id, response, exception)
+        self._batch.add(request.request, callback=record, request_id=request_id)
+
+    def execute(self, *args, **kwargs) -> None:
+        self._batch.execute(*args, **kwargs)
+
+
+class RecordingResource:
+    def __init__(self, resource, path: str, store: FixtureStore):
+        self._resource = resource
+        self._path = path
+        self._store = store
+
+    def __getattr__(self, name: str) -> Any:
+        method = getattr(self._resource, name)
+        path = f"{self._path}.{name}"
+
+        def call(**kwargs):
+            result = method(**kwargs)
+            if hasattr(result, "execute"):
+                return RecordingRequest(result, make_key(path, kwargs), self._store)
+            return RecordingResource(result, path, self._store)
+        return call
+
+
+class RecordingCalendar(RecordingResource):
+    """
+    Proxy around a Calendar service recording every executed request.
+    """
+
+    def __init__(self, service, store: FixtureStore):
+        super().__init__(service, "calendar", store)
+
+    def new_batch_http_request(self, callback: Callable | None = None) -> RecordingBatch:
+        return RecordingBatch(self._resource.new_batch_http_request(callback=callback))
+
+
+# ---------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------
+class ReplayRequest:
+    """
+    Stand-in HttpRequest serving a recorded response.
+    Unrecorded requests get a 404, or a 410 for incremental syncs
+    (so the caller falls back to a full sync); injected errors a 503.
+    """
+
+    def __init__(self, path: str, kwargs: Dict[str, Any], store: FixtureStore, conditions: ReplayConditions):
+        self.uri = path
+        self._kwargs = kwargs
+        self._key = make_key(path, kwargs)
+        self._store = store
+        self._conditions = conditions
+
+    def execute(self, *args, **kwargs) -> Any:
+        if self._conditions.apply():
+            raise make_http_error(503, "Injected error", self.uri)
+        found, recorded = self._store.replay(self._key)
+        if not found:
+            raise make_http_error(410 if self._kwargs.get("syncToken") else 404, "No fixture", self.uri)
+        if "error" in recorded:
+            raise make_http_error(recorded["status"], recorded["error"], self.uri)
+        return recorded["result"]
+
+
+class ReplayBatch:
+    """
+    Stand-in BatchHttpRequest executing its member requests one by one.
+    """
+
+    def __init__(self, callback: Callable | None):
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request: ReplayRequest, callback: Callable | None = None, request_id: str | None = None) -> None:
+        self._requests.append((request, callback, request_id or str(len(self._requests) + 1)))
+
+    def execute(self, *args, **kwargs) -> None:
+        for request, callback, request_id in self._requests:
+            try:
+                response, exception = request.execute(), None
+            except HttpError as e:
+                response, exception = None, e
+            for handler in (callback, self._callback):
+                if handler is not None:
+                    handler(request_id, response, exception)
+
+
+class ReplayResource:
+    def __init__(self, path: str, store: FixtureStore, conditions: ReplayConditions):
+        self._path = path
+        self._store = store
+        self._conditions = conditions
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        path = f"{self._path}.{name}"
+
+        def call(**kwargs):
+            if name in REQUEST_METHODS:
+                return ReplayRequest(path, kwargs, self._store, self._conditions)
+            return ReplayResource(path, self._store, self._conditions)
+        return call
+
+
+class ReplayCalendar(ReplayResource):
+    """
+    Local stand-in for a Calendar service serving recorded responses.
+    """
+
+    def __init__(self, store: FixtureStore, conditions: ReplayConditions):
+        super().__init__("calendar", store, conditions)
+
+    def new_batch_http_request(self, callback: Callable | None = None) -> ReplayBatch:
+        return ReplayBatch(callback)
@@ -0,0 +1,90 @@
+"""
+Open-Meteo recording session and local stand-in.
+
+openmeteo_requests only calls session.request(), and decodes the
+FlatBuffers body itself, so recording happens at the HTTP level:
+response bodies are stored base64-encoded under the request URL
+and parameters.
+"""
+
+import base64
+import json
+from typing import Any
+import requests
+from code.tracing import record_response
+from .fixtures import FixtureStore, ReplayConditions, make_key
+
+
+def get_request_key(method: str, url: str, kwargs: dict) -> str:
+    return make_key(method.upper(), url, kwargs.get("params"), kwargs.get("data"))
+
+
+class RecordingSession:
+    """
+    Proxy around a requests session saving every response to the fixture store.
+    """
+
+    def __init__(self, session, store: FixtureStore):
+        self._session = session
+        self._store = store
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+    def request(self, method: str, url: str, **kwargs):
+        response = self._session.request(method, url, **kwargs)
+        self._store.record(get_request_key(method, url, kwargs), {
+            "status_code": response.status_code,
+            "content": base64.b64encode(response.content).decode("ascii"),
+        })
+        return response
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+
+class ReplayResponse:
+    """
+    The parts of requests.Response the Open-Meteo client uses.
+    """
+
+    def __init__(self, status_code: int, content: bytes, url: str):
+        self.status_code = status_code
+        self.content = content
+        self.url = url
+        self.ok = status_code < 400
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class ReplaySession:
+    """
+    Local stand-in for the Open-Meteo HTTP session serving recorded responses.
+    Unrecorded requests get a 404, injected errors a 503.
+    """
+
+    def __init__(self, store: FixtureStore, conditions: ReplayConditions):
+        self._store = store
+        self._conditions = conditions
+
+    def request(self, method: str, url: str, **kwargs) -> ReplayResponse:
+        if self._conditions.apply():
+            return ReplayResponse(503, b'{"error": true, "reason": "Injected error"}', url)
+        found, recorded = self._store.replay(get_request_key(method, url, kwargs))
+        if not found:
+            return ReplayResponse(404, b'{"error": true, "reason": "No fixture"}', url)
+        return record_response(ReplayResponse(recorded["status_code"], base64.b64decode(recorded["content"]), url))
+
+    def get(self, url: str, **kwargs) -> ReplayResponse:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> ReplayResponse:
+        return self.request("POST", url, **kwargs)
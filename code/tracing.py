@@ -0,0 +1,259 @@
+"""
+Timing traces for pipeline stages and outbound API calls.
+
+Enabled with the RUN_DATA_TRACE environment variable (a trace file path,
+or 1 for data/traces/trace-<time>.json) or run_pipeline --trace.
+Recorded spans:
+- every pipeline stage, extract_* function, weather/calendar entry point
+  and storage write
+- every Garmin, Open-Meteo and Google Calendar call, with its arguments,
+  response bytes, cache outcome and time spent waiting on the rate limiter
+
+Spans are written in Chrome trace-event format (open in chrome://tracing
+or https://ui.perfetto.dev), together with a flat summary table.
+When tracing is off, API clients are not wrapped and traced functions
+and spans only check one global.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, List
+
+
+TRACE_SETTING = os.getenv("RUN_DATA_TRACE", "")
+TRACE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "traces")
+
+# Longest argument repr kept in a span
+MAX_ARG_LENGTH = 120
+
+_TRACER: "Tracer | None" = None
+_LOCAL = threading.local()
+
+
+class Tracer:
+    """
+    Thread-safe collector of completed spans.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.pid = os.getpid()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, str] = {}
+
+    def add(self, name: str, category: str, start: float, end: float, args: Dict[str, Any]) -> None:
+        tid = threading.get_ident()
+        event = {
+            "name": name, "cat": category, "ph": "X", "pid": self.pid, "tid": tid,
+            "ts": (start - self._origin) * 1e6, "dur": (end - start) * 1e6, "args": args,
+        }
+        with self._lock:
+            self._threads.setdefault(tid, threading.current_thread().name)
+            self._events.append(event)
+
+    def to_chrome(self) -> Dict[str, Any]:
+        """
+        Return the trace as a Chrome trace-event document.
+        """
+        with self._lock:
+            metadata = [
+                {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                for tid, name in self._threads.items()
+            ]
+            events = sorted(self._events, key=lambda event: event["ts"])
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def summarize(self) -> List[Dict[str, Any]]:
+        """
+        Aggregate spans by (category, name), slowest total first.
+        """
+        rows: Dict[tuple, Dict[str, Any]] = defaultdict(lambda: {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "bytes": 0, "cache_hits": 0, "errors": 0})
+        with self._lock:
+            for event in self._events:
+                row = rows[(event["cat"], event["name"])]
+                duration = event["dur"] / 1000
+                row["calls"] += 1
+                row["total_ms"] += duration
+                row["max_ms"] = max(row["max_ms"], duration)
+                row["bytes"] += event["args"].get("bytes", 0)
+                row["cache_hits"] += event["args"].get("cache") == "hit"
+                row["errors"] += "error" in event["args"]
+        summary = [{"category": category, "name": name, **row, "mean_ms": row["total_ms"] / row["calls"]} for (category, name), row in rows.items()]
+        return sorted(summary, key=lambda row: row["total_ms"], reverse=True)
+
+    def format_summary(self) -> str:
+        """
+        Return the summary as a fixed-width text table.
+        """
+        lines = [f"{'category':<10} {'name':<44} {'calls':>6} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'bytes':>10} {'hits':>5} {'errors':>6}"]
+        for row in self.summarize():
+            lines.append(
+                f"{row['category']:<10} {row['name'][:44]:<44} {row['calls']:>6} {row['total_ms']:>10.1f} "
+                f"{row['mean_ms']:>9.1f} {row['max_ms']:>9.1f} {row['bytes']:>10} {row['cache_hits']:>5} {row['errors']:>6}"
+            )
+        return "\n".join(lines)
+
+    def write(self) -> str:
+        """
+        Write the Chrome trace and, next to it, the summary table.
+        Returns the summary table.
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump(self.to_chrome(), f, default=str)
+        summary = self.format_summary()
+        with open(os.path.splitext(self.path)[0] + ".summary.txt", "w") as f:
+            f.write(summary + "\n")
+        return summary
+
+
+# ---------------------------------------------------------------------
+# Switching On and Off
+# ---------------------------------------------------------------------
+def is_tracing() -> bool:
+    return _TRACER is not None
+
+
+def enable_tracing(path: str | None = None) -> Tracer:
+    """
+    Start recording spans to path (default: a timestamped file in data/traces).
+    The trace is written when finish_tracing() is called, or at exit.
+    """
+    global _TRACER
+    if _TRACER is None:
+        _TRACER = Tracer(path or os.path.join(TRACE_DIR, time.strftime("trace-%Y%m%d-%H%M%S.json")))
+        atexit.register(finish_tracing)
+    return _TRACER
+
+
+def finish_tracing() -> str | None:
+    """
+    Stop tracing, write the trace and print the summary table.
+    Returns the trace path, or None if tracing was off.
+    """
+    global _TRACER
+    tracer, _TRACER = _TRACER, None
+    if tracer is None:
+        return None
+    print(tracer.write())
+    print("Trace written to", tracer.path)
+    return tracer.path
+
+
+# ---------------------------------------------------------------------
+# Spans
+# ---------------------------------------------------------------------
+def get_open_spans() -> list:
+    if not hasattr(_LOCAL, "spans"):
+        _LOCAL.spans = []
+    return _LOCAL.spans
+
+
+@contextmanager
+def span(name: str, category: str = "api", **args):
+    """
+    Record the enclosed block as one span.
+    Yields the span's argument dict, which the block may extend.
+    """
+    tracer = _TRACER
+    if tracer is None:
+        yield args
+        return
+    spans = get_open_spans()
+    spans.append(args)
+    start = time.perf_counter()
+    try:
+        yield args
+    except BaseException as e:
+        args["error"] = type(e).__name__
+        raise
+    finally:
+        spans.pop()
+        tracer.add(name, category, start, time.perf_counter(), args)
+
+
+def annotate(**values) -> None:
+    """
+    Set arguments on the innermost open span of this thread.
+    """
+    if _TRACER is not None and get_open_spans():
+        get_open_spans()[-1].update(values)
+
+
+def accumulate(key: str, amount: float) -> None:
+    """
+    Add to a numeric argument of the innermost open span of this thread.
+    """
+    if _TRACER is not None and get_open_spans():
+        args = get_open_spans()[-1]
+        args[key] = args.get(key, 0) + amount
+
+
+def record_response(response, *args, **kwargs):
+    """
+    requests response hook adding the body size (and requests_cache
+    hits) to the span of the API call that sent the request.
+    """
+    accumulate("bytes", len(response.content or b""))
+    if getattr(response, "from_cache", False):
+        annotate(cache="hit")
+    return response
+
+
+def record_payload(payload: Any) -> None:
+    """
+    Add the JSON size of a decoded response to the current span
+    (for clients whose HTTP layer cannot be hooked).
+    """
+    if _TRACER is not None:
+        accumulate("bytes", len(json.dumps(payload, default=str)))
+
+
+def format_args(args: tuple, kwargs: Dict[str, Any]) -> str:
+    parts = [repr(arg) for arg in args] + [f"{key}={value!r}" for key, value in kwargs.items()]
+    text = ", ".join(parts)
+    return text if len(text) <= MAX_ARG_LENGTH else text[:MAX_ARG_LENGTH - 3] + "..."
+
+
+def trace_call(name: str, func: Callable, category: str = "api") -> Callable:
+    """
+    Return func wrapped in a span recording its arguments,
+    or func itself when tracing is off.
+    """
+    if _TRACER is None:
+        return func
+
+    @wraps(func)
+    def call(*args, **kwargs):
+        with span(name, category, args=format_args(args, kwargs)):
+            return func(*args, **kwargs)
+    return call
+
+
+def traced(name: str | None = None, category: str = "stage") -> Callable:
+    """
+    Decorator recording every call of a function as a span.
+    """
+    def decorate(func: Callable) -> Callable:
+        span_name = name or func.__name__
+
+        @wraps(func)
+        def call(*args, **kwargs):
+            if _TRACER is None:
+                return func(*args, **kwargs)
+            with span(span_name, category):
+                return func(*args, **kwargs)
+        return call
+    return decorate
+
+
+if TRACE_SETTING:
+    enable_tracing(None if TRACE_SETTING.lower() in ("1", "true", "yes") else TRACE_SETTING)
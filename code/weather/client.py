@@ -5,6 +5,11 @@ Open-Meteo client configuration with caching and retry behavior.
 import requests_cache
 import openmeteo_requests
 from retry_requests import retry
+from code.replay import get_replay_mode, get_fixture_store, get_replay_conditions
+from code.tracing import is_tracing, record_response
+
+
+_WEATHER_CLIENT = None
 
 
 def build_weather_client():
@@ -13,6 +18,27 @@ def build_weather_client():
     Returns:
         Client: Configured Open-Meteo client
     """
+    mode = get_replay_mode()
+    if mode == "replay":
+        from code.replay.openmeteo import ReplaySession
+        return openmeteo_requests.Client(session=ReplaySession(get_fixture_store("openmeteo"), get_replay_conditions()))
+
     cache_session = requests_cache.CachedSession(".cache", expire_after=3600)
+    if is_tracing():
+        cache_session.hooks["response"].append(record_response)
     retry_session = retry(cache_session, retries=5, backoff_factor=0.2)
-    return openmeteo_requests.Client(session=retry_session)
\ No newline at end of file
+    if mode == "record":
+        from code.replay.openmeteo import RecordingSession
+        retry_session = RecordingSession(retry_session, get_fixture_store("openmeteo"))
+    return openmeteo_requests.Client(session=retry_session)
+
+
+def get_weather_client():
+    """
+    Return the process-wide Open-Meteo client, so its HTTP session
+    (and keep-alive connections) are reused across requests.
+    """
+    global _WEATHER_CLIENT
+    if _WEATHER_CLIENT is None:
+        _WEATHER_CLIENT = build_weather_client()
+    return _WEATHER_CLIENT
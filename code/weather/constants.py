@@ -4,6 +4,9 @@ Weather API constants and configuration values.
 
 URL = "https://historical-forecast-api.open-meteo.com/v1/forecast"
 
+# Grid size (degrees) used to group nearby run locations into one request
+WEATHER_GRID_DEGREES = 0.1
+
 # Variables requested hourly
 HOURLY_VARIABLES = [
     "apparent_temperature",
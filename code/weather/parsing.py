@@ -4,22 +4,24 @@ Parsing helpers for Open-Meteo API responses.
 
 import numpy as np
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 
-def extract_hourly_data(response, hour: int | None) -> Dict[str, Any]:
+def extract_hourly_data(response, hour: int | None, day_index: int = 0) -> Dict[str, Any]:
 	"""
 	Extract hourly weather metrics.
 	Args:
 		response (Any): Open-Meteo API response object
 		hour (Optional[int]): Hour to extract, if None returns median
+		day_index (int): Day within a multi-day response
 	Returns:
 		dict: Hourly weather metrics
 	"""
 	hourly = response.Hourly()
+	day_slice = slice(24 * day_index, 24 * (day_index + 1))
 
 	def get_value(index, cast=float):
-		values = hourly.Variables(index).ValuesAsNumpy().astype(cast)
+		values = hourly.Variables(index).ValuesAsNumpy()[day_slice].astype(cast)
 		if hour is not None:
 			return values[hour].item()
 		return np.median(values).item()
@@ -35,11 +37,12 @@ def extract_hourly_data(response, hour: int | None) -> Dict[str, Any]:
 	}
 
 
-def extract_daily_data(response):
+def extract_daily_data(response, day_index: int = 0):
 	"""
 	Extract daily aggregated weather metrics.
 	Args:
 		response (Any): Open-Meteo API response object
+		day_index (int): Day within a multi-day response
 	Returns:
 		dict: Daily weather metrics
 	"""
@@ -48,15 +51,15 @@ def extract_daily_data(response):
 	def get_value(index, cast=float):
 		values = daily.Variables(index).ValuesAsNumpy()
 		if hasattr(values, "__len__"):
-			values = values[0]
+			values = values[day_index]
 		if cast is not None:
 			values = cast(values)
 		return np.median(values).item()
 
 	return {
 		"daily_weather_code": get_value(0, int),
-		"daily_sunrise": datetime.fromtimestamp(daily.Variables(1).ValuesInt64AsNumpy()[0]).strftime("%H:%M:%S"),
-		"daily_sunset": datetime.fromtimestamp(daily.Variables(2).ValuesInt64AsNumpy()[0]).strftime("%H:%M:%S"),
+		"daily_sunrise": datetime.fromtimestamp(daily.Variables(1).ValuesInt64AsNumpy()[day_index]).strftime("%H:%M:%S"),
+		"daily_sunset": datetime.fromtimestamp(daily.Variables(2).ValuesInt64AsNumpy()[day_index]).strftime("%H:%M:%S"),
 		"daily_daylight_duration": get_value(3, int) // 3600,
 		"daily_temperature_2m_max": round(get_value(4)),
 		"daily_temperature_2m_min": round(get_value(5)),
@@ -67,3 +70,106 @@ def extract_daily_data(response):
 		"daily_snowfall_sum": round(get_value(10), 1),
 		"daily_precipitation_hours": round(get_value(11))
 	}
+
+
+# ---------------------------------------------------------------------
+# Multi-day (vectorized) parsing
+# ---------------------------------------------------------------------
+# (output key, decimals) per hourly variable, in HOURLY_VARIABLES order.
+# decimals=0 rounds to int, None keeps the integer weather code as is.
+HOURLY_FIELDS = [
+	("hourly_apparent_temperature", 0),
+	("hourly_rain_mm", 1),
+	("hourly_showers_mm", 1),
+	("hourly_snowfall_mm", 1),
+	("hourly_snow_depth_cm", 1),
+	("hourly_wind_speed_10m_kmh", 1),
+	("hourly_weather_code", None),
+]
+
+# (output key, variable index, decimals) for numeric daily variables
+DAILY_FIELDS = [
+	("daily_temperature_2m_max", 4, 0),
+	("daily_temperature_2m_min", 5, 0),
+	("daily_temperature_2m_mean", 6, 0),
+	("daily_apparent_temperature_mean", 7, 0),
+	("daily_rain_sum", 8, 1),
+	("daily_showers_sum", 9, 1),
+	("daily_snowfall_sum", 10, 1),
+	("daily_precipitation_hours", 11, 0),
+]
+
+
+def round_column(values: np.ndarray, decimals: int) -> List:
+	"""
+	Round a column like the scalar helpers: decimals=0 yields ints.
+	"""
+	if decimals == 0:
+		return np.rint(values).astype(int).tolist()
+	return np.round(values, decimals).tolist()
+
+
+def get_hourly_block(response) -> np.ndarray:
+	"""
+	Reshape the hourly variables of a multi-day response into a
+	(days, 24, variables) array.
+	"""
+	hourly = response.Hourly()
+	values = np.stack([hourly.Variables(i).ValuesAsNumpy() for i in range(len(HOURLY_FIELDS))], axis=-1)
+	return values.reshape(-1, 24, len(HOURLY_FIELDS))
+
+
+def extract_hourly_range(response, hours: List[int | None]) -> List[Dict[str, Any]]:
+	"""
+	Extract hourly weather metrics for every day of a multi-day response.
+	Args:
+		response (Any): Open-Meteo API response object
+		hours (List[Optional[int]]): Per-day hour to extract, None for the daily median
+	Returns:
+		list: One dict of hourly metrics per day
+	"""
+	block = get_hourly_block(response).astype(float)
+	day_index = np.arange(block.shape[0])
+	has_hour = np.array([hour is not None for hour in hours])
+	hour_index = np.array([hour if hour is not None else 0 for hour in hours])
+
+	values = np.where(has_hour[:, None], block[day_index, hour_index], np.median(block, axis=1))
+
+	codes = block[..., -1].astype(int)
+	picked_codes = codes[day_index, hour_index].tolist()
+	median_codes = np.median(codes, axis=1).tolist()
+
+	columns = [round_column(values[:, i], decimals) for i, (_, decimals) in enumerate(HOURLY_FIELDS[:-1])]
+	columns.append([picked if has else median for picked, median, has in zip(picked_codes, median_codes, has_hour)])
+
+	keys = [key for key, _ in HOURLY_FIELDS]
+	return [dict(zip(keys, row)) for row in zip(*columns)]
+
+
+def extract_daily_range(response) -> List[Dict[str, Any]]:
+	"""
+	Extract daily aggregated weather metrics for every day of a multi-day response.
+	Args:
+		response (Any): Open-Meteo API response object
+	Returns:
+		list: One dict of daily metrics per day
+	"""
+	daily = response.Daily()
+
+	def get_values(index):
+		return np.atleast_1d(daily.Variables(index).ValuesAsNumpy())
+
+	def format_times(index):
+		return [datetime.fromtimestamp(timestamp).strftime("%H:%M:%S") for timestamp in daily.Variables(index).ValuesInt64AsNumpy().tolist()]
+
+	columns = {
+		"daily_weather_code": get_values(0).astype(int).astype(float).tolist(),
+		"daily_sunrise": format_times(1),
+		"daily_sunset": format_times(2),
+		"daily_daylight_duration": (get_values(3).astype(int).astype(float) // 3600).tolist(),
+	}
+	for key, index, decimals in DAILY_FIELDS:
+		columns[key] = round_column(get_values(index).astype(float), decimals)
+
+	keys = ["daily_weather_code", "daily_sunrise", "daily_sunset", "daily_daylight_duration"] + [key for key, _, _ in DAILY_FIELDS]
+	return [dict(zip(keys, row)) for row in zip(*(columns[key] for key in keys))]
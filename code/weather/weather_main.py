@@ -11,56 +11,100 @@ It relies on:
 - Parsing helpers for hourly and daily weather data
 """
 
+from datetime import date, timedelta
 from typing import Dict, Any
 from code.garmin.utils import get_today_date
 from code.garmin.extract import extract_today_run_stats, extract_location_stats
-from code.garmin.example import init_api
-from .client import build_weather_client
+from code.garmin.session import get_garmin_api
+from code.garmin.snapshot import ActivitySnapshot
+from code.tracing import traced, span
+from .client import get_weather_client
 from .constants import URL, HOURLY_VARIABLES, DAILY_VARIABLES
-from .parsing import extract_hourly_data, extract_daily_data
+from .parsing import extract_hourly_data, extract_daily_data, extract_hourly_range, extract_daily_range
 
 
-def extract_weather_data() -> Dict[str, Any]:
+@traced(category="weather")
+def extract_weather_data(coords=None, run_start_time: str | None = None) -> Dict[str, Any]:
 	"""
     Main entry point for weather extraction.
     
     Steps:
-    1. Initialize Garmin API and extract location.
+    1. Get the shared Garmin client and extract location.
     2. Determine current run hour (if a run is happening today).
     3. Build Open-Meteo client and fetch weather.
     4. Extract hourly and daily metrics.
+
+    When the pipeline already has the location coordinates and today's
+    run start time, they are passed in and steps 1-2 are skipped.
     """
-	garmin_api = init_api()
-	garmin_location_stats = extract_location_stats(garmin_api)
-	coords = garmin_location_stats.get("location_coordinates")
+	if coords is None:
+		garmin_api = get_garmin_api()
+		snapshot = ActivitySnapshot.fetch(garmin_api)
+		coords = extract_location_stats(garmin_api, snapshot).get("location_coordinates")
+		run_start_time = extract_today_run_stats(garmin_api, snapshot).get("run_today_start_time")
 
 	if not coords:
 		raise ValueError("No location coordinates found")
 
-	run_stats = extract_today_run_stats(garmin_api)
-	run_start_time = run_stats.get("run_today_start_time")
-	run_start_hour = int(run_start_time.split(":")[0]) if run_start_time else None
+	run_start_hour = get_run_start_hour(run_start_time)
+
+	response = fetch_weather(coords, get_today_date(), get_today_date())
+
+	return extract_hourly_data(response, run_start_hour) | extract_daily_data(response)
+
 
-	client = build_weather_client()
+def get_run_start_hour(run_start_time: str | None) -> int | None:
+	"""
+	Convert a run start time (HH:MM:SS) to its hour, if a run happened.
+	"""
+	return int(run_start_time.split(":")[0]) if run_start_time else None
+
+
+def fetch_weather(coords, start_date: date, end_date: date):
+	"""
+	Fetch hourly and daily weather for a contiguous date span in one request.
+	"""
+	client = get_weather_client()
 
 	params = {
 		"latitude": coords[0],
 		"longitude": coords[1],
-		"start_date": get_today_date(),
-		"end_date": get_today_date(),
+		"start_date": start_date,
+		"end_date": end_date,
 		"hourly": HOURLY_VARIABLES,
 		"daily": DAILY_VARIABLES,
 		"timezone": "auto"
 	}
 
-	responses = client.weather_api(URL, params=params)
+	with span("openmeteo.weather_api", latitude=coords[0], longitude=coords[1], start_date=str(start_date), end_date=str(end_date)):
+		responses = client.weather_api(URL, params=params)
+	return responses[0]
+
+
+@traced(category="weather")
+def extract_weather_range(coords, run_hours: Dict[date, int | None]) -> Dict[date, Dict[str, Any]]:
+	"""
+	Extract weather metrics for several days at one location
+	with a single request spanning the first to the last day.
+	All days are parsed in one vectorized pass.
+	Args:
+		coords: (latitude, longitude)
+		run_hours: Mapping day -> run start hour (None for daily median)
+	"""
+	start_date, end_date = min(run_hours), max(run_hours)
+	response = fetch_weather(coords, start_date, end_date)
+
+	span_days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+	hourly = extract_hourly_range(response, [run_hours.get(day) for day in span_days])
+	daily = extract_daily_range(response)
 
-	return extract_hourly_data(responses[0], run_start_hour) | extract_daily_data(responses[0])
+	return {day: hourly[i] | daily[i] for i, day in enumerate(span_days) if day in run_hours}
 
 
-def main():
+@traced("weather_main", category="weather")
+def main(coords=None, run_start_time: str | None = None):
 	try:
-		return extract_weather_data()
+		return extract_weather_data(coords, run_start_time)
 	except Exception as e:
 		print(e)
 
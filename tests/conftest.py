@@ -0,0 +1,20 @@
+"""
+Shared test setup.
+
+Points every persistent cache and state file at a temporary directory
+before any code.* module reads its configuration, so tests never touch
+the files under data/.
+"""
+
+import os
+import tempfile
+
+
+STATE_DIR = tempfile.mkdtemp(prefix="run-data-tests-")
+
+for variable, filename in (
+    ("GEO_CACHE_PATH", "geo_cache.sqlite"),
+    ("GARMIN_CACHE_PATH", "garmin_cache.sqlite"),
+    ("ROLLING_STATE_PATH", "rolling_state.json"),
+):
+    os.environ[variable] = os.path.join(STATE_DIR, filename)
@@ -0,0 +1,23 @@
+"""
+Smoke test for the benchmark suite: every benchmark sets up and runs
+once on tiny inputs, so a broken benchmark fails here rather than in
+a full (minutes-long) benchmark run.
+"""
+
+import pytest
+from benchmarks.run import BENCHMARKS, PRODUCTION_SIZES
+
+
+# Smallest fraction of production size that still exercises every code path
+SMOKE_DIVISOR = 100
+
+
+@pytest.mark.parametrize("name", sorted(BENCHMARKS))
+def test_benchmark_runs_on_tiny_input(name, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    size_key, setup = BENCHMARKS[name]
+    try:
+        func = setup(max(1, PRODUCTION_SIZES[size_key] // SMOKE_DIVISOR))
+    except ModuleNotFoundError as e:
+        pytest.skip(f"{name} needs {e.name}")
+    func()
@@ -0,0 +1,101 @@
+"""
+Parity tests for the single-pass multi-day calendar features.
+"""
+
+import random
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from dateutil import parser
+from code.calendar.parsing import get_event_bounds, get_next_three_days_window, process_range_events
+
+
+FIRST_DAY = date(2026, 3, 2)
+N_DAYS = 14
+
+
+def make_event(start: datetime, end: datetime, summary: str = "Event") -> dict:
+    return {"summary": summary, "start": {"dateTime": start.isoformat()}, "end": {"dateTime": end.isoformat()}}
+
+
+def make_all_day_event(day: date, summary: str) -> dict:
+    return {"summary": summary, "start": {"date": day.isoformat()}, "end": {"date": (day + timedelta(days=1)).isoformat()}}
+
+
+def random_events(rng: random.Random, n: int, summaries: list) -> list:
+    origin = datetime.combine(FIRST_DAY - timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+    events = []
+    for _ in range(n):
+        start = origin + timedelta(minutes=15 * rng.randrange(4 * 24 * (N_DAYS + 3)))
+        if rng.random() < 0.1:
+            events.append(make_all_day_event(start.date(), rng.choice(summaries)))
+        else:
+            events.append(make_event(start, start + timedelta(minutes=15 * rng.randint(1, 24)), rng.choice(summaries)))
+    return events
+
+
+def events_in_window(events: list, start: str, end: str) -> list:
+    """
+    Select the events overlapping [start, end), like the store's window query.
+    """
+    window_start, window_end = parser.isoparse(start), parser.isoparse(end)
+    selected = []
+    for event in events:
+        event_start, event_end = get_event_bounds(event)
+        if event_start < window_end and event_end > window_start:
+            selected.append(event)
+    return selected
+
+
+def single_day_stats(class_events: list, work_events: list, day: date) -> dict:
+    """
+    One day computed the way extract_calendar_stats does: events from the
+    day's three-day store window, features from a one-day range.
+    """
+    start, end = get_next_three_days_window(day)
+    return process_range_events(events_in_window(class_events, start, end), events_in_window(work_events, start, end), day, day)[day]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_range_matches_single_days(seed):
+    rng = random.Random(seed)
+    class_events = random_events(rng, 40, ["Lecture", "Lab"])
+    work_events = random_events(rng, 40, ["Meeting", "Project deadline", "Report due"])
+
+    last_day = FIRST_DAY + timedelta(days=N_DAYS - 1)
+    stats = process_range_events(class_events, work_events, FIRST_DAY, last_day)
+
+    for i in range(N_DAYS):
+        day = FIRST_DAY + timedelta(days=i)
+        assert stats[day] == single_day_stats(class_events, work_events, day), day
+
+
+def test_event_crossing_midnight_is_split_between_days():
+    start = datetime(2026, 3, 2, 22, tzinfo=timezone.utc)
+    work_events = [make_event(start, start + timedelta(hours=4))]
+
+    stats = process_range_events([], work_events, date(2026, 3, 2), date(2026, 3, 3))
+    assert stats[date(2026, 3, 2)]["work_hours"] == 2.0
+    assert stats[date(2026, 3, 3)]["work_hours"] == 2.0
+    assert stats[date(2026, 3, 2)]["after_5pm"] and not stats[date(2026, 3, 3)]["after_5pm"]
+    for day in (date(2026, 3, 2), date(2026, 3, 3)):
+        assert single_day_stats([], work_events, day)["work_hours"] == 2.0
+
+
+def test_deadlines_look_three_days_ahead():
+    work_events = [make_all_day_event(date(2026, 3, 6), "Thesis deadline")]
+
+    stats = process_range_events([], work_events, date(2026, 3, 2), date(2026, 3, 8))
+    assert [stats[date(2026, 3, d)]["upcoming_deadline_next_three_days"] for d in range(2, 9)] == [False, False, True, True, True, False, False]
+
+
+def test_busy_hours_merge_overlapping_class_and_work_time():
+    start = datetime(2026, 3, 2, 9, tzinfo=timezone.utc)
+    class_events = [make_event(start, start + timedelta(hours=2)), make_event(start + timedelta(hours=5), start + timedelta(hours=6))]
+    work_events = [make_event(start + timedelta(hours=1), start + timedelta(hours=3)), make_event(start + timedelta(hours=14), start + timedelta(hours=17))]
+
+    stats = process_range_events(class_events, work_events, date(2026, 3, 2), date(2026, 3, 3))
+    # 09:00-12:00 merged, 14:00-15:00, 23:00-24:00 (the rest falls on the next day)
+    assert stats[date(2026, 3, 2)]["class_hours"] == 3.0
+    assert stats[date(2026, 3, 2)]["work_hours"] == 3.0
+    assert stats[date(2026, 3, 2)]["busy_hours"] == 5.0
+    assert stats[date(2026, 3, 3)]["busy_hours"] == 2.0
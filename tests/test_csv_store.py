@@ -0,0 +1,116 @@
+"""
+Tests for the CSV storage backend and its on-disk date index.
+"""
+
+import os
+from datetime import date, timedelta
+import pandas as pd
+import pytest
+from code.pipeline.schema import FINAL_SCHEMA
+from code.pipeline.storage import csv_store
+
+
+@pytest.fixture(autouse=True)
+def data_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "running_dataset.csv")
+    monkeypatch.setattr(csv_store, "DATA_PATH", path)
+    return path
+
+
+def make_row(day: date, km: float = 5.0) -> dict:
+    row = {column: None for column in FINAL_SCHEMA}
+    row.update(date=day.isoformat(), run_today_boolean=True, run_today_distance_km=km)
+    return row
+
+
+def stored_dates() -> list:
+    return [day.date().isoformat() for day in csv_store.load_dataset(["date"])["date"]]
+
+
+def index_entries() -> list:
+    with open(csv_store.get_index_path(), "rb") as index:
+        return [csv_store.read_index_entry(index, position) for position in range(csv_store.count_index_entries(index))]
+
+
+DAYS = [date(2026, 3, 1) + timedelta(days=i) for i in range(10)]
+
+
+def test_appends_keep_rows_sorted():
+    for day in DAYS:
+        csv_store.save_row(make_row(day))
+
+    assert stored_dates() == [day.isoformat() for day in DAYS]
+    assert csv_store.index_is_valid()
+
+
+def test_out_of_order_rows_are_inserted_in_place():
+    for day in DAYS[::2] + DAYS[1::2]:
+        csv_store.save_row(make_row(day))
+
+    assert stored_dates() == [day.isoformat() for day in DAYS]
+    assert [row_date for row_date, _ in index_entries()] == [day.isoformat() for day in DAYS]
+    assert csv_store.index_is_valid()
+
+
+def test_saving_an_existing_date_replaces_the_row():
+    csv_store.save_rows([make_row(day) for day in DAYS])
+    csv_store.save_row(make_row(DAYS[3], km=12.5))
+
+    df = csv_store.load_dataset(["date", "run_today_distance_km"])
+    assert len(df) == len(DAYS)
+    assert df.loc[df["date"] == pd.Timestamp(DAYS[3]), "run_today_distance_km"].item() == pytest.approx(12.5)
+
+
+def test_index_offsets_point_at_their_rows():
+    csv_store.save_rows([make_row(day) for day in reversed(DAYS)])
+
+    with open(csv_store.DATA_PATH, "rb") as f:
+        for row_date, offset in index_entries():
+            f.seek(offset)
+            assert f.readline().startswith(row_date.encode() + b",")
+
+
+@pytest.mark.parametrize("row_date, after, expected", [
+    ("2026-02-01", False, 0),
+    ("2026-03-01", False, 0),
+    ("2026-03-01", True, 1),
+    ("2026-03-05", False, 4),
+    ("2026-03-05", True, 5),
+    ("2026-03-10", True, 10),
+    ("2026-04-01", False, 10),
+])
+def test_find_index_position_matches_bisect(row_date, after, expected):
+    csv_store.save_rows([make_row(day) for day in DAYS])
+
+    with open(csv_store.get_index_path(), "rb") as index:
+        assert csv_store.find_index_position(index, row_date, after) == expected
+
+
+def test_stale_index_is_rebuilt():
+    csv_store.save_rows([make_row(day) for day in DAYS[:5]])
+    os.remove(csv_store.get_index_path())
+    csv_store.save_rows([make_row(day) for day in DAYS[5:]])
+
+    assert stored_dates() == [day.isoformat() for day in DAYS]
+    assert csv_store.index_is_valid()
+
+
+def test_range_reads_only_return_matching_rows():
+    csv_store.save_rows([make_row(day) for day in DAYS])
+
+    df = csv_store.load_dataset(["date"], start="2026-03-03", end="2026-03-06")
+    assert [day.date() for day in df["date"]] == DAYS[2:6]
+    assert len(csv_store.load_dataset(["date"], start="2026-04-01")) == 0
+    assert len(csv_store.load_dataset(["date"], end="2026-02-01")) == 0
+
+
+def test_csv_written_before_a_column_was_added_is_upgraded(data_path):
+    old_schema = [column for column in FINAL_SCHEMA if column != "busy_hours"]
+    pd.DataFrame([make_row(DAYS[0])], columns=old_schema).to_csv(data_path, index=False)
+
+    assert csv_store.load_dataset(["date", "busy_hours"])["busy_hours"].isna().all()
+
+    csv_store.save_row(make_row(DAYS[1]))
+    assert csv_store.read_header() == FINAL_SCHEMA
+    assert stored_dates() == [DAYS[0].isoformat(), DAYS[1].isoformat()]
+    assert csv_store.index_is_valid()
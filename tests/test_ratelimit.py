@@ -0,0 +1,114 @@
+"""
+Tests for the shared Garmin token bucket and its error classification.
+"""
+
+import time
+import pytest
+
+pytest.importorskip("garminconnect")
+pytest.importorskip("garth")
+
+from garminconnect import GarminConnectConnectionError
+from code.garmin import ratelimit
+from code.garmin.ratelimit import RateLimiter, get_status_code, get_retry_after, is_overloaded, install_rate_limiter
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: dict | None = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def wrapped_http_error(status_code: int, headers: dict | None = None) -> GarminConnectConnectionError:
+    """
+    A garminconnect error re-raised from an HTTP error, like connectapi does.
+    """
+    try:
+        try:
+            error = ConnectionError(f"{status_code} Server Error")
+            error.response = FakeResponse(status_code, headers)
+            raise error
+        except ConnectionError as e:
+            raise GarminConnectConnectionError("Error connecting") from e
+    except GarminConnectConnectionError as e:
+        return e
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(ratelimit, "GARMIN_BACKOFF_SECONDS", 0.01)
+
+
+def test_bucket_allows_burst_then_limits_rate():
+    limiter = RateLimiter(rate=50.0, burst=5)
+    started = time.monotonic()
+    for _ in range(15):
+        limiter.acquire()
+    elapsed = time.monotonic() - started
+
+    # 5 burst tokens, then 10 tokens at 50 per second
+    assert 0.15 <= elapsed < 1.0
+    assert limiter.requests == 15
+    assert limiter.throttled > 0
+
+
+def test_status_and_retry_after_come_from_the_chained_error():
+    error = wrapped_http_error(429, {"Retry-After": "2"})
+
+    assert getattr(error, "response", None) is None
+    assert get_status_code(error) == 429
+    assert get_retry_after(error) == 2.0
+    assert is_overloaded(wrapped_http_error(503))
+    assert not is_overloaded(wrapped_http_error(404))
+
+
+def test_error_text_alone_is_not_a_rate_limit():
+    assert not is_overloaded(GarminConnectConnectionError("activity 4290001 not found"))
+
+
+def test_call_retries_overload_and_halves_rate():
+    limiter = RateLimiter(rate=100.0, burst=10)
+    responses = iter([wrapped_http_error(503), wrapped_http_error(429), "ok"])
+
+    def request():
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    assert limiter.call(request) == "ok"
+    assert limiter.backoffs == 2
+    assert limiter.rate < 100.0
+
+
+def test_call_reraises_other_errors_without_retrying():
+    limiter = RateLimiter(rate=100.0, burst=10)
+    calls = []
+
+    def request():
+        calls.append(1)
+        raise wrapped_http_error(404)
+
+    with pytest.raises(GarminConnectConnectionError):
+        limiter.call(request)
+    assert len(calls) == 1 and limiter.backoffs == 0
+
+
+def test_installed_limiter_counts_every_http_request():
+    class FakeGarth:
+        def request(self, method, subdomain, path, **kwargs):
+            return path
+
+    class FakeGarmin:
+        def __init__(self):
+            self.garth = FakeGarth()
+
+        def get_activities(self, pages):
+            return [self.garth.request("GET", "connectapi", f"/page/{page}") for page in range(pages)]
+
+    api = FakeGarmin()
+    limiter = RateLimiter(rate=100.0, burst=10)
+    install_rate_limiter(api, limiter)
+
+    assert api.get_activities(3) == ["/page/0", "/page/1", "/page/2"]
+    assert limiter.requests == 3
@@ -0,0 +1,71 @@
+"""
+Tests for the schema's typed loading and columnar batches.
+"""
+
+import pandas as pd
+import pytest
+from code.pipeline.schema import FINAL_SCHEMA, INTEGER_COLUMNS, DATASET_DTYPES, RowBatch, apply_dtypes, enforce_schema
+from code.pipeline.storage import csv_store
+
+
+def test_counts_and_codes_load_as_small_nullable_integers():
+    df = apply_dtypes(pd.DataFrame({
+        "days_since_last_run": [3.0, None],
+        "run_today_training_load": [67.0, None],
+        "daily_weather_code": [53.0, 3.0],
+        "run_today_distance_km": [12.2, None],
+    }))
+
+    assert df["days_since_last_run"].dtype == "Int8"
+    assert df["run_today_training_load"].dtype == "Int16"
+    assert df["daily_weather_code"].dtype == "Int8"
+    assert df["run_today_distance_km"].dtype == "float32"
+    assert df["days_since_last_run"].tolist() == [3, pd.NA]
+
+
+def test_integer_columns_are_schema_columns():
+    assert set(INTEGER_COLUMNS) <= set(FINAL_SCHEMA)
+    assert all(DATASET_DTYPES[column] == dtype for column, dtype in INTEGER_COLUMNS.items())
+
+
+def make_daily_row(day: str) -> dict:
+    """
+    A row shaped like the daily pipeline's output (ints for counts, floats for metrics).
+    """
+    return enforce_schema({
+        "date": day, "day_of_the_week": "Sunday", "last_night_HRV": 56, "last_night_RHR": 49,
+        "run_today_boolean": True, "run_today_distance_km": 12.2, "run_today_duration_min": 77,
+        "run_today_training_load": 67, "days_since_last_run": 3, "days_since_last_gym": None,
+        "location_coordinates": (53.36, -6.24), "hourly_weather_code": 2.5, "daily_weather_code": 53,
+        "class_hours": 1.5, "gym_available": False,
+    })
+
+
+def test_batch_to_rows_keeps_integers():
+    batch = RowBatch()
+    batch.append(make_daily_row("2026-03-01"))
+
+    row = batch.to_rows()[0]
+    assert row["run_today_duration_min"] == 77 and isinstance(row["run_today_duration_min"], int)
+    assert row["days_since_last_gym"] is None
+    assert row["run_today_distance_km"] == pytest.approx(12.2)
+    assert row == {**make_daily_row("2026-03-01"), "location_coordinates": (53.36, -6.24)}
+
+
+def test_daily_and_batch_paths_write_identical_csv_lines(tmp_path, monkeypatch):
+    lines = {}
+    for path in ("daily", "batch"):
+        monkeypatch.setattr(csv_store, "DATA_PATH", str(tmp_path / f"{path}.csv"))
+        if path == "daily":
+            csv_store.save_row(make_daily_row("2026-03-01"))
+            csv_store.save_row(make_daily_row("2026-03-02"))
+        else:
+            batch = RowBatch()
+            batch.append(make_daily_row("2026-03-01"))
+            batch.append(make_daily_row("2026-03-02"))
+            csv_store.save_frame(batch.to_pandas())
+        with open(csv_store.DATA_PATH) as f:
+            lines[path] = f.read()
+
+    assert lines["daily"] == lines["batch"]
+    assert ",77,67," in lines["batch"]